@@ -1,21 +1,2778 @@
+import time
 import sys
 import os
 import json
 import re
 import uuid
-from PySide6.QtWidgets import (
+import sqlite3
+import hashlib
+import mmap
+import struct
+import array
+import zipfile
+import threading
+import atexit
+import functools
+import itertools
+import traceback
+import logging
+import logging.handlers
+from bisect import bisect_left, insort
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+STARTUP_T0 = time.perf_counter() # Origin of the startup timeline, taken before the (much slower) Qt imports
+from PySide6.QtWidgets import (  # noqa: E402
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog,
-    QListWidget, QListWidgetItem, QLabel, QListView, QStackedWidget,
-    QLineEdit, QTextEdit, QDialog, QDialogButtonBox, QTableWidget,
-    QTableWidgetItem, QButtonGroup, QHeaderView, QStyle, QSizePolicy,
-    QMenu, QMessageBox, QSpacerItem
+    QLabel, QListView, QStackedWidget, QStyledItemDelegate, QStyleOptionViewItem,
+    QLineEdit, QTextEdit, QDialog, QDialogButtonBox, QTableView,
+    QButtonGroup, QHeaderView, QStyle, QSizePolicy,
+    QMenu, QMessageBox, QSpacerItem, QProgressDialog, QInputDialog
 )
-from PySide6.QtGui import QPixmap, QIcon, QColor, QPainter, QPen, QDesktopServices
-from PySide6.QtCore import Qt, QSize, QMargins, QTimer, QRect, QUrl, QEvent
+from PySide6.QtGui import QPixmap, QIcon, QColor, QPainter, QPen, QDesktopServices, QImage, QImageReader, QFont, QFontMetrics  # noqa: E402
+from PySide6.QtCore import (  # noqa: E402
+    Qt, QSize, QMargins, QTimer, QRect, QUrl, QEvent, QObject, QRunnable, QThreadPool, Signal, QPoint,
+    QAbstractListModel, QAbstractTableModel, QModelIndex, QFileSystemWatcher, QBuffer, QByteArray, QIODevice
+)
+
+
+def env_number(name, default, minimum, maximum, cast=int):
+    """Reads a numeric MANGAQ_* override, falling back to default on a bad value and clamping to [minimum, maximum]."""
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = cast(raw)
+    except ValueError:
+        print(f"Warning: Ignoring {name}={raw!r} (not a number); using {default}")
+        return default
+    if value != value: # NaN compares unequal to everything and would slip through the clamp
+        print(f"Warning: Ignoring {name}={raw!r}; using {default}")
+        return default
+    clamped = min(max(value, minimum), maximum)
+    if clamped != value:
+        print(f"Warning: {name}={raw!r} is outside {minimum}-{maximum}; using {clamped}")
+    return clamped
+
+
+METADATA_DIR = "metadata" # One JSON file per manga entry, relative to the working directory
+MANIFEST_DIR = os.path.join(METADATA_DIR, "manifests") # Per-series chapter/page manifests, next to the metadata
+MANIFEST_MAX_DEPTH = 4 # Folder levels below a series searched for chapters (e.g. Volume/Chapter)
+MANIFEST_CACHE_ENTRIES = 64 # Manifests kept in memory
+LIBRARY_DB_PATH = "library.db" # Single-file SQLite store, used when MANGAQ_STORE=sqlite
+LIBRARY_SNAPSHOT_NAME = "library.snapshot" # Binary copy of every parsed entry, inside METADATA_DIR
+THUMBNAIL_CACHE_DIR = ".thumbnails" # Pre-scaled covers, relative to the working directory like METADATA_DIR
+THUMBNAIL_CACHE_BYTES = env_number("MANGAQ_THUMB_CACHE_MB", 256, 1, 65536) * 1024 * 1024
+# Covers are pre-rendered off the GUI thread into these size tiers (1x and 2x for the list view,
+# the edit dialog and the range of grid widths); views paint the nearest tier, see cover_tier()
+COVER_TIERS = (QSize(60, 80), QSize(120, 160), QSize(180, 240), QSize(360, 480), QSize(540, 720))
+GRID_MIN_ITEM_WIDTH = 140 # Adaptive grid: as many columns as fit at this minimum cover width
+GRID_COLUMNS = env_number("MANGAQ_GRID_COLUMNS", 0, 0, 64) # Fixed column count; 0 = adaptive
+COVER_PIXMAP_CACHE_BYTES = env_number("MANGAQ_PIXMAP_CACHE_MB", 128, 1, 16384) * 1024 * 1024 # In-memory budget for decoded cover pixmaps
+EMPTY_LIBRARY_TEXT = "No manga folders added yet.\nClick 'Select Folder' to get started!"
+NO_SEARCH_RESULTS_TEXT = "No entries match your search."
+LOADING_LIBRARY_TEXT = "Loading library..."
+IMAGE_EXTENSIONS = (".png", ".webp", ".jpg", ".jpeg", ".svg") # Same formats the cover picker accepts
+ARCHIVE_EXTENSIONS = (".cbz", ".zip") # Chapter/volume archives read in place, never extracted
+ARCHIVE_SEPARATOR = "::" # Page paths inside archives look like "Vol 1.cbz::001.jpg"
+ARCHIVE_CACHE_ENTRIES = 16 # Archives kept open (central directory parsed, file memory-mapped)
+SCAN_WORKERS = env_number("MANGAQ_SCAN_WORKERS", 16, 1, 256) # Parallel os.scandir() calls during a library scan
+SCAN_MAX_DEPTH = 8 # Folder levels below the library root searched for series
+HEALTH_CHECK_WORKERS = env_number("MANGAQ_HEALTH_WORKERS", 64, 1, 1024) # Parallel os.stat() calls during a health check
+HEALTH_CHECK_TIMEOUT_S = env_number("MANGAQ_HEALTH_TIMEOUT", 3.0, 0.1, 600.0, cast=float) # A stat taking longer marks its folder unreachable
+HEALTH_CHECK_PATH = ".health_check.json" # Last health check's problems, relative to the working directory
+READER_PREFETCH = env_number("MANGAQ_READER_PREFETCH", 4, 0, 64) # Pages decoded ahead of and behind the reader
+BULK_UPDATE_THRESHOLD = 200 # Added entries above which the views are rebuilt once instead of row by row
+WRITE_BEHIND_DELAY_MS = 100 # Metadata saves arriving within this window are written (and fsynced) as one batch
+TRACE_PATH = os.environ.get("MANGAQ_TRACE", "") # Chrome trace-event JSON written on exit; empty = tracing off
+DEBUG_LOGGING = os.environ.get("MANGAQ_DEBUG", "") not in ("", "0") # Print the "DEBUG:" diagnostics
+STALL_LOG_PATH = os.environ.get("MANGAQ_STALL_LOG", "") # Rolling log of GUI-thread stalls; empty = watchdog off
+STALL_THRESHOLDS_MS = (16, 50, 250) # Stall histogram buckets: a dropped frame, noticeable lag, a visible hang
+FAST_START = os.environ.get("MANGAQ_FAST_START", "1") != "0" # Show a cached first screen and load the library in the background
+STARTUP_SNAPSHOT_PATH = ".startup_snapshot.json" # First screenful of entries, saved on exit, relative to the working directory
+STARTUP_SNAPSHOT_ENTRIES = 200 # Entries kept in the snapshot (more than a maximized grid shows)
+STARTUP_REPORT = os.environ.get("MANGAQ_STARTUP_REPORT", "") not in ("", "0") # Print the startup timeline
+
+
+def debug_log(message):
+    """Prints a DEBUG diagnostic when MANGAQ_DEBUG is set."""
+    if DEBUG_LOGGING:
+        print(f"DEBUG: {message}")
+
+
+# --- Tracing Classes ---
+class _Span:
+    """One timed section; hands its start/end times to the Tracer when it exits."""
+    __slots__ = ("tracer", "name", "args", "start_ns")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start_ns = 0
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.record(self.name, self.start_ns, time.perf_counter_ns(), self.args)
+        return False
+
+
+class _NoSpan:
+    """Shared stand-in for _Span while tracing is off."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Tracer:
+    """
+    Times named spans around the hot paths (library loads and saves, decodes, relayouts, scans).
+    Off unless MANGAQ_TRACE names an output file: span() then returns a shared no-op and traced()
+    leaves functions undecorated. When on, spans from every thread are kept as Chrome trace events
+    (load the file in chrome://tracing or ui.perfetto.dev) and a per-operation summary is printed on exit.
+    """
+    MAX_EVENTS = 500000 # Spans past this still count in the summary but are not kept as events
+
+    def __init__(self, output_path=""):
+        self.output_path = output_path
+        self.enabled = bool(output_path)
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+        self._events = []   # (name, start_ns, duration_ns, thread id, args)
+        self._stats = {}    # name -> [count, total_ns, max_ns]
+        self._threads = {}  # thread id -> thread name
+        self._counters = {} # name -> {value name: running total}
+        self._finished = False
+        if self.enabled:
+            atexit.register(self.finish)
+
+    def span(self, name, **args):
+        """Context manager timing the enclosed block as one `name` span."""
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name, args or None)
+
+    def traced(self, name):
+        """Decorator timing every call of a function as a `name` span."""
+        def decorate(func):
+            if not self.enabled:
+                return func
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with _Span(self, name, None):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def record(self, name, start_ns, end_ns, args=None):
+        """Adds a finished span. Safe to call from worker threads."""
+        duration = end_ns - start_ns
+        thread_id = threading.get_ident()
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                self._stats[name] = [1, duration, duration]
+            else:
+                stats[0] += 1
+                stats[1] += duration
+                if duration > stats[2]:
+                    stats[2] = duration
+            if len(self._events) < self.MAX_EVENTS:
+                if thread_id not in self._threads:
+                    self._threads[thread_id] = threading.current_thread().name
+                self._events.append((name, start_ns, duration, thread_id, args))
+
+    def count(self, name, **values):
+        """Adds values to the running totals of counter `name` (shown after the span summary)."""
+        with self._lock:
+            totals = self._counters.setdefault(name, {})
+            for value_name, value in values.items():
+                totals[value_name] = totals.get(value_name, 0) + value
+
+    def counters(self):
+        with self._lock:
+            return {name: dict(totals) for name, totals in self._counters.items()}
+
+    def chrome_trace(self):
+        """Returns the recorded spans in the Chrome trace-event format."""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        trace_events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                        for tid, name in threads.items()]
+        for name, start_ns, duration, tid, args in events:
+            event = {"name": name, "cat": name.split(".", 1)[0], "ph": "X", "pid": pid, "tid": tid,
+                     "ts": (start_ns - self._origin_ns) / 1000, "dur": duration / 1000}
+            if args:
+                event["args"] = {key: str(value) for key, value in args.items()}
+            trace_events.append(event)
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms", "otherData": {"counters": self.counters()}}
+
+    def write(self, path=None):
+        path = path or self.output_path
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.chrome_trace(), f)
+        except OSError as e:
+            print(f"Warning: Could not write trace {path}: {e}")
+            return False
+        return True
+
+    def summary(self):
+        """Per-operation totals, slowest total first, as printable text."""
+        with self._lock:
+            rows = sorted(self._stats.items(), key=lambda item: item[1][1], reverse=True)
+        lines = [f"{'Operation':<32}{'Count':>8}{'Total ms':>12}{'Mean ms':>10}{'Max ms':>10}"]
+        for name, (count, total, longest) in rows:
+            lines.append(f"{name:<32}{count:>8}{total / 1e6:>12.1f}{total / count / 1e6:>10.2f}{longest / 1e6:>10.2f}")
+        for name, totals in sorted(self.counters().items()):
+            lines.append(f"{name}: " + ", ".join(f"{value_name}={value}" for value_name, value in totals.items()))
+        return "\n".join(lines)
+
+    def finish(self):
+        """Writes the trace file and prints the summary (once; also runs at interpreter exit)."""
+        if not self.enabled or self._finished:
+            return
+        self._finished = True
+        if self.write():
+            print(f"Trace written to {self.output_path}")
+        print(self.summary())
+
+
+TRACER = Tracer(TRACE_PATH)
+
+
+class StartupTimeline:
+    """
+    Milestones of one cold start, measured from STARTUP_T0. Each milestone is also traced as a span
+    from the previous one, and the timeline is printed once finished when MANGAQ_STARTUP_REPORT is set.
+    """
+
+    def __init__(self, origin=STARTUP_T0):
+        self.origin = origin
+        self.marks = [] # (label, seconds since origin)
+        self.finished = False
+
+    def mark(self, label):
+        if self.finished:
+            return
+        now = time.perf_counter()
+        previous = self.marks[-1][1] + self.origin if self.marks else self.origin
+        self.marks.append((label, now - self.origin))
+        if TRACER.enabled:
+            TRACER.record(f"startup.{label}", int(previous * 1e9), int(now * 1e9))
+
+    def finish(self, label):
+        """Records the last milestone and prints the report if requested."""
+        self.mark(label)
+        self.finished = True
+        if STARTUP_REPORT:
+            print(self.report())
+
+    def report(self):
+        lines = ["Startup timeline:"]
+        for label, seconds in self.marks:
+            lines.append(f"  {seconds * 1000:8.1f} ms  {label}")
+        return "\n".join(lines)
+
+
+# --- Stall Watchdog Class ---
+class StallWatchdog(QObject):
+    """
+    Opt-in event-loop latency monitor for the GUI thread, enabled with MANGAQ_STALL_LOG=<file>.
+    A QTimer beats every HEARTBEAT_MS; a beat arriving late means the event loop was blocked. A monitor
+    thread notices the missing beats while the stall is still going on and samples the main thread's
+    Python stack, so every logged stall shows what the GUI thread was busy with. Stalls are appended to
+    a rolling log and counted in a histogram that is logged and printed when the watchdog stops.
+    """
+    HEARTBEAT_MS = 10
+    LOG_MAX_BYTES = 1024 * 1024
+    LOG_BACKUPS = 3
+    STACK_DEPTH = 25 # Innermost frames kept per stack sample
+
+    def __init__(self, log_path, thresholds_ms=STALL_THRESHOLDS_MS, parent=None):
+        super().__init__(parent)
+        self.log_path = log_path
+        self.thresholds_ms = sorted(thresholds_ms)
+        self.histogram = [0] * len(self.thresholds_ms) # Stalls per bucket [threshold, next threshold)
+        self.longest_ms = 0.0
+        self._main_thread_id = threading.get_ident()
+        self._last_beat_ns = time.perf_counter_ns()
+        self._stalls = deque() # (start_ns, duration_ms) reported by the GUI thread, consumed by the monitor
+        self._samples = {}     # beat time -> stack sample of the stall that followed it
+        self._started_at = time.time()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._monitor, name="StallWatchdog", daemon=True)
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(self.HEARTBEAT_MS)
+        self._timer.timeout.connect(self._beat)
+
+        self._log = logging.getLogger("mangaq.stalls")
+        self._log.propagate = False
+        self._log.setLevel(logging.INFO)
+        if not self._log.handlers:
+            handler = logging.handlers.RotatingFileHandler(log_path, maxBytes=self.LOG_MAX_BYTES,
+                                                           backupCount=self.LOG_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self._log.addHandler(handler)
+
+    def start(self):
+        self._last_beat_ns = time.perf_counter_ns()
+        self._timer.start()
+        self._thread.start()
+        self._log.info(f"Session started (pid {os.getpid()}, thresholds {self.thresholds_ms} ms)")
+
+    def stop(self):
+        """Stops monitoring, logs the histogram and returns it as a dict."""
+        if self._stop.is_set():
+            return self.summary()
+        self._timer.stop()
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self._drain()
+        summary = self.summary()
+        self._log.info(f"Session summary {json.dumps(summary)}")
+        print("UI stalls this session: " + ", ".join(f"{label}: {count}" for label, count in summary["histogram"].items()))
+        return summary
+
+    def summary(self):
+        labels = [f"{low}-{high} ms" for low, high in zip(self.thresholds_ms, self.thresholds_ms[1:])]
+        labels.append(f">={self.thresholds_ms[-1]} ms")
+        return {
+            "session_s": round(time.time() - self._started_at, 1),
+            "stalls": sum(self.histogram),
+            "longest_ms": round(self.longest_ms, 1),
+            "histogram": dict(zip(labels, self.histogram)),
+        }
+
+    def _beat(self):
+        now = time.perf_counter_ns()
+        late_ms = (now - self._last_beat_ns) / 1e6 - self.HEARTBEAT_MS
+        if late_ms >= self.thresholds_ms[0]:
+            self._stalls.append((self._last_beat_ns, late_ms))
+            if TRACER.enabled:
+                TRACER.record("ui.stall", self._last_beat_ns, now)
+        self._last_beat_ns = now
+
+    # --- Monitor thread ---
+    def _monitor(self):
+        poll = self.HEARTBEAT_MS / 2000
+        stalled_beat = None # Beat the current stall started from
+        level = 0           # Thresholds crossed so far by the current stall
+        while not self._stop.wait(poll):
+            beat = self._last_beat_ns
+            lag_ms = (time.perf_counter_ns() - beat) / 1e6 - self.HEARTBEAT_MS
+            if beat != stalled_beat:
+                stalled_beat, level = beat, 0
+            crossed = level
+            while crossed < len(self.thresholds_ms) and lag_ms >= self.thresholds_ms[crossed]:
+                crossed += 1
+            if crossed > level:
+                # Re-sample at every threshold so long stalls show where the time finally went
+                level = crossed
+                self._samples[beat] = self._main_thread_stack()
+            self._drain(keep=beat)
+
+    def _main_thread_stack(self):
+        frame = sys._current_frames().get(self._main_thread_id)
+        if frame is None:
+            return None
+        return "".join(traceback.format_stack(frame, limit=self.STACK_DEPTH)).rstrip()
+
+    def _drain(self, keep=None):
+        """Logs the stalls the GUI thread has reported, with their stack samples."""
+        while self._stalls:
+            start_ns, duration_ms = self._stalls.popleft()
+            bucket = sum(1 for threshold in self.thresholds_ms if duration_ms >= threshold) - 1
+            self.histogram[bucket] += 1
+            self.longest_ms = max(self.longest_ms, duration_ms)
+            stack = self._samples.pop(start_ns, None) or "(no stack sample)"
+            self._log.info(f"Stall {duration_ms:.0f} ms (>= {self.thresholds_ms[bucket]} ms) on the GUI thread:\n{stack}")
+        for beat in [beat for beat in self._samples if beat != keep]:
+            del self._samples[beat] # Sampled, but the beat arrived just under the threshold
+
+
+# --- Library Index Classes ---
+class _LibraryBase:
+    """Helpers shared by the JSON and SQLite library backends."""
+
+    @staticmethod
+    def normalize_folder(folder_path):
+        return os.path.normpath(folder_path) if folder_path else ""
+
+    @staticmethod
+    def key_for(data, file_name=None):
+        """Entries are keyed by UUID; legacy files without one fall back to their file stem."""
+        if data.get("uuid"):
+            return data["uuid"]
+        if file_name:
+            return os.path.splitext(file_name)[0]
+        return None
+
+    def resolve_key(self, data):
+        """
+        Returns the key data will be stored under.
+        Prioritizes existing UUID, otherwise reuses the entry already indexed for the folder.
+        A new UUID is assigned to data when neither exists.
+        """
+        if data.get("uuid"):
+            return data["uuid"]
+
+        key = self.key_for_folder(data["folder"])
+        if key is not None:
+            existing = self.get(key)
+            if existing and existing.get("uuid"):
+                debug_log(f"Found existing UUID for '{self.normalize_folder(data['folder'])}': {existing['uuid']}")
+                data["uuid"] = existing["uuid"]
+            return key
+
+        data["uuid"] = str(uuid.uuid4())
+        debug_log(f"Generating new UUID for '{self.normalize_folder(data['folder'])}': {data['uuid']}")
+        return data["uuid"]
+
+    def file_name_for(self, data):
+        return f"{self.resolve_key(data)}.json"
+
+
+class MetadataWriter:
+    """
+    Write-behind queue for the metadata JSON files, drained by one background thread.
+    Each file is written crash-safely (temp file, fsync, rename over the original), so an interrupted
+    write leaves the previous version in place instead of a truncated file. Repeated saves of the same
+    file before it is written are coalesced into one write, and each batch ends with a single fsync of
+    the directory. A failed write is retried up to MAX_ATTEMPTS times (a newer save of the file starts
+    over), then given up and reported through on_failure(file_name, error), which is called on the
+    writer thread. close() (also run at exit) waits for everything queued and returns what could not
+    be written.
+    """
+    RETRY_DELAY = 1.0
+    MAX_ATTEMPTS = 5
+
+    def __init__(self, directory, delay_ms=WRITE_BEHIND_DELAY_MS):
+        self.directory = directory
+        self.delay = delay_ms / 1000
+        self._cond = threading.Condition()
+        self._queue = OrderedDict() # file name -> JSON text, or None to delete the file
+        self._in_progress = set()   # file names of the batch being written
+        self._written = {}          # file name -> (mtime_ns, size) after our write, None once deleted
+        self._attempts = {}         # file name -> failed attempts at its queued content
+        self.failed = {}            # file name -> error of the last write that was given up
+        self.on_failure = None
+        self._thread = None
+        self._closed = False
+
+    def write(self, file_name, text):
+        self._enqueue(file_name, text)
+
+    def delete(self, file_name):
+        self._enqueue(file_name, None)
+
+    def _enqueue(self, file_name, text):
+        with self._cond:
+            self._queue.pop(file_name, None) # Re-queue at the end; the newest content wins
+            self._queue[file_name] = text
+            self._attempts.pop(file_name, None)
+            if self._thread is None or not self._thread.is_alive():
+                if self._thread is None:
+                    atexit.register(self.close)
+                self._closed = False
+                self._thread = threading.Thread(target=self._run, name="MetadataWriter", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def is_pending(self, file_name):
+        """True while a write or delete of file_name is queued or in progress."""
+        with self._cond:
+            return file_name in self._queue or file_name in self._in_progress
+
+    def pending_files(self):
+        """File names with a write or delete queued or in progress."""
+        with self._cond:
+            return set(self._queue) | self._in_progress
+
+    def take_written(self):
+        """Returns and clears the (mtime_ns, size) of the files written since the last call."""
+        with self._cond:
+            written, self._written = self._written, {}
+        return written
+
+    def flush(self, timeout=None):
+        """Waits until every queued change is on disk. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._in_progress, timeout)
+
+    def close(self, timeout=10):
+        """Waits for the queued changes and stops the thread. Returns the file names left unwritten."""
+        with self._cond:
+            self._closed = True # Retry failures right away instead of after RETRY_DELAY
+            self._cond.notify_all()
+        self.flush(timeout)
+        with self._cond:
+            unsaved = sorted(set(self._queue) | self._in_progress | set(self.failed))
+            self.failed.clear() # Reported once; the exit hook's close() stays quiet
+        if unsaved:
+            print(f"Warning: {len(unsaved)} metadata changes could not be written to '{self.directory}': {', '.join(unsaved)}")
+        return unsaved
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if self._closed and not self._queue:
+                    return
+            if not self._closed:
+                time.sleep(self.delay) # Let a burst of saves collect into one batch
+            with self._cond:
+                batch, self._queue = self._queue, OrderedDict()
+                self._in_progress = set(batch)
+            written, failed = self._write_batch(batch)
+            given_up = {}
+            with self._cond:
+                self._written.update(written)
+                for file_name in written:
+                    self._attempts.pop(file_name, None)
+                    self.failed.pop(file_name, None)
+                for file_name, (text, error) in failed.items():
+                    if file_name in self._queue:
+                        continue # A newer save replaced it meanwhile
+                    attempts = self._attempts.get(file_name, 0) + 1
+                    if attempts >= self.MAX_ATTEMPTS:
+                        self._attempts.pop(file_name, None)
+                        self.failed[file_name] = given_up[file_name] = error
+                    else:
+                        self._attempts[file_name] = attempts
+                        self._queue[file_name] = text
+                self._in_progress = set()
+                self._cond.notify_all()
+            for file_name, error in given_up.items():
+                print(f"Error: Gave up writing metadata file {os.path.join(self.directory, file_name)}: {error}")
+                if self.on_failure is not None:
+                    self.on_failure(file_name, error)
+            if failed and not given_up:
+                with self._cond:
+                    if not self._closed:
+                        self._cond.wait(self.RETRY_DELAY)
+
+    def _write_batch(self, batch):
+        written, failed = {}, {}
+        os.makedirs(self.directory, exist_ok=True)
+        for file_name, text in batch.items():
+            path = os.path.join(self.directory, file_name)
+            try:
+                if text is None:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                    written[file_name] = None
+                    continue
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+                st = os.stat(path)
+                written[file_name] = (st.st_mtime_ns, st.st_size)
+            except OSError as e:
+                print(f"Warning: Could not write metadata file {path}, will retry: {e}")
+                failed[file_name] = (text, str(e))
+        if written:
+            self._sync_directory()
+        return written, failed
+
+    def _sync_directory(self):
+        """Makes the batch's renames and deletions durable (POSIX only; a no-op where unsupported)."""
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+class LibraryIndex(_LibraryBase):
+    """
+    In-memory index over the metadata directory, loaded once and kept in sync on save/delete.
+    The parsed entries are also kept in a binary snapshot file, so a cold load only has to parse
+    the JSON files that were added or modified since the snapshot was written.
+    """
+    SNAPSHOT_MAGIC = b"MQLIBSNP"
+    SNAPSHOT_VERSION = 1
+    SNAPSHOT_HEADER = struct.Struct("<8sII") # magic, version, entry count
+    SNAPSHOT_FIELDS = ("name", "description", "cover", "folder", "uuid")
+
+    def __init__(self, metadata_dir=METADATA_DIR):
+        self.metadata_dir = metadata_dir
+        self.snapshot_path = os.path.join(metadata_dir, LIBRARY_SNAPSHOT_NAME)
+        self.records = {}          # key (uuid, or file stem for legacy entries) -> metadata dict
+        self.folder_to_key = {}    # normalized folder path -> key
+        self.file_names = {}       # key -> JSON file name inside metadata_dir
+        self._file_keys = {}       # JSON file name -> key
+        self._file_stats = {}      # file name -> (mtime_ns, size) at the time it was parsed
+        self._skipped_files = {}   # file name -> (mtime_ns, size) of corrupted/duplicate files, re-read only once changed
+        self.writer = MetadataWriter(metadata_dir)
+        self._load_lock = threading.Lock()
+        self._snapshot_dirty = False # The index differs from the snapshot file
+        self.loaded = False
+
+    @TRACER.traced("library.refresh")
+    def refresh(self):
+        """
+        Brings the index up to date with the metadata directory.
+        Only JSON files whose mtime/size changed since they were last parsed are re-read.
+        Returns (changed_keys, removed_keys, issues) where issues is a list of
+        ("duplicate" | "corrupted", file_name, detail) tuples.
+        """
+        changed, removed, issues = [], [], []
+        # Take the writer's state before scanning: a file it writes while the scan runs is then still
+        # known as pending below (costing one extra parse at most) instead of looking deleted
+        self._absorb_writes()
+        pending = self.writer.pending_files()
+        current_stats = {}
+        if os.path.exists(self.metadata_dir):
+            with os.scandir(self.metadata_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(".json") or not entry.is_file():
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    current_stats[entry.name] = (st.st_mtime_ns, st.st_size)
+
+        if not self.loaded and not self.records:
+            self._restore_snapshot(current_stats)
+
+        # Drop entries whose files disappeared
+        for file_name in list(self._file_stats):
+            if file_name not in current_stats and file_name not in pending and not self.writer.is_pending(file_name):
+                key = self._forget_file(file_name)
+                if key is not None:
+                    removed.append(key)
+        for file_name in list(self._skipped_files):
+            if file_name not in current_stats:
+                del self._skipped_files[file_name]
+
+        # Parse new or modified files, in file name order like the original directory scans
+        for file_name in sorted(current_stats):
+            stat = current_stats[file_name]
+            if self._file_stats.get(file_name) == stat or self._skipped_files.get(file_name) == stat:
+                continue
+            if file_name in pending or self.writer.is_pending(file_name):
+                continue # The index already holds the newer content that is (about to be) written
+            self._read_file(file_name, stat, changed, removed, issues)
+
+        if changed or removed:
+            self._snapshot_dirty = True
+        self.loaded = True
+        return changed, removed, issues
+
+    @TRACER.traced("library.refresh_files")
+    def refresh_files(self, file_names):
+        """
+        Like refresh(), but only stats and re-reads the given metadata file names (reported by
+        MetadataWatcher), so the cost doesn't depend on the library size. Files written by our own
+        writer are recognised by their stat and left alone.
+        """
+        changed, removed, issues = [], [], []
+        self._absorb_writes()
+        pending = self.writer.pending_files()
+        for file_name in sorted(set(file_names)):
+            if file_name in pending:
+                continue
+            try:
+                st = os.stat(os.path.join(self.metadata_dir, file_name))
+                stat = (st.st_mtime_ns, st.st_size)
+            except FileNotFoundError:
+                stat = None
+            except OSError as e:
+                print(f"Warning: Could not check metadata file {file_name}: {e}")
+                continue
+            if stat is None:
+                self._skipped_files.pop(file_name, None)
+                if file_name in self._file_stats:
+                    key = self._forget_file(file_name)
+                    if key is not None:
+                        removed.append(key)
+                continue
+            if self._file_stats.get(file_name) == stat or self._skipped_files.get(file_name) == stat:
+                continue
+            self._read_file(file_name, stat, changed, removed, issues)
+        if changed or removed:
+            self._snapshot_dirty = True
+        return changed, removed, issues
+
+    def _read_file(self, file_name, stat, changed, removed, issues):
+        """Parses one metadata file into the index, appending to refresh()'s result lists."""
+        file_path = os.path.join(self.metadata_dir, file_name)
+        try:
+            with TRACER.span("library.read_json"):
+                with open(file_path, "r", encoding="utf-8") as f:
+                    text = f.read()
+            with TRACER.span("library.parse_json"):
+                data = json.loads(text)
+        except json.JSONDecodeError:
+            print(f"Error: Corrupted JSON file detected: {file_path}")
+            self._skipped_files[file_name] = stat
+            issues.append(("corrupted", file_name, file_path))
+            return
+        except Exception as e:
+            print(f"An unexpected error occurred while loading {file_path}: {e}")
+            return
+
+        if not isinstance(data, dict) or not data.get("folder"):
+            print(f"Warning: JSON file {file_name} is missing 'folder' key. Skipping.")
+            self._skipped_files[file_name] = stat
+            return
+
+        key = self.key_for(data, file_name)
+        normalized_folder_path = self.normalize_folder(data["folder"])
+        owner = self.folder_to_key.get(normalized_folder_path)
+        if owner is not None and owner != key:
+            debug_log(f"WARNING! Duplicate entry detected for folder: '{normalized_folder_path}'. "
+                  f"Skipping JSON file: {file_name}. "
+                  f"This usually means multiple metadata files point to the same folder.")
+            self._skipped_files[file_name] = stat
+            issues.append(("duplicate", file_name, normalized_folder_path))
+            return
+
+        previous_key = self._file_keys.get(file_name)
+        if previous_key is not None and previous_key != key:
+            removed.append(self._forget_key(previous_key))
+        previous_file = self.file_names.get(key)
+        if previous_file is not None and previous_file != file_name:
+            self._forget_file(previous_file)
+        self._skipped_files.pop(file_name, None)
+        self._remember(key, data, file_name, stat)
+        changed.append(key)
+
+    def _absorb_writes(self):
+        """Our own background writes are already in the index; only their new stats are needed."""
+        for file_name, stat in self.writer.take_written().items():
+            if stat is not None and file_name in self._file_keys:
+                self._file_stats[file_name] = stat
+
+    def load(self):
+        """
+        Performs the initial full load (once) and returns the issues found.
+        May run on a worker thread; calls made meanwhile from other threads wait for it to finish.
+        """
+        with self._load_lock:
+            if self.loaded:
+                return []
+            _, _, issues = self.refresh()
+            if self._snapshot_dirty:
+                self.write_snapshot()
+            return issues
+
+    def file_stats(self):
+        """(mtime_ns, size) of every JSON file on disk that the index has read, including skipped ones."""
+        self._absorb_writes()
+        stats = {name: stat for name, stat in self._file_stats.items() if stat is not None} # None: not written yet
+        stats.update(self._skipped_files)
+        return stats
+
+    def change_token(self):
+        """
+        Value that changes whenever an entry is added, removed or saved (every write is a rename into
+        the directory); a single stat, so it can be checked before the first frame. Edits made in place
+        by other programs don't change it: the startup snapshot's rows are replaced by the loaded
+        library anyway, which is where those show up. None if the directory does not exist.
+        """
+        try:
+            return os.stat(self.metadata_dir).st_mtime_ns
+        except OSError:
+            return None
+
+    def _remember(self, key, data, file_name, stat):
+        old = self.records.get(key)
+        if old is not None:
+            old_folder = self.normalize_folder(old.get("folder"))
+            if self.folder_to_key.get(old_folder) == key:
+                del self.folder_to_key[old_folder]
+        self.records[key] = data
+        self.folder_to_key[self.normalize_folder(data.get("folder"))] = key
+        self.file_names[key] = file_name
+        self._file_keys[file_name] = key
+        self._file_stats[file_name] = stat
+
+    def _forget_file(self, file_name):
+        self._file_stats.pop(file_name, None)
+        key = self._file_keys.get(file_name)
+        return self._forget_key(key) if key is not None else None
+
+    def _forget_key(self, key):
+        data = self.records.pop(key, None)
+        file_name = self.file_names.pop(key, None)
+        if file_name is not None:
+            self._file_stats.pop(file_name, None)
+            self._file_keys.pop(file_name, None)
+        if data is not None:
+            folder = self.normalize_folder(data.get("folder"))
+            if self.folder_to_key.get(folder) == key:
+                del self.folder_to_key[folder]
+        return key
+
+    # --- Lookups (all O(1)) ---
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, key):
+        return self.records.get(key)
+
+    def contains_folder(self, folder_path):
+        return self.normalize_folder(folder_path) in self.folder_to_key
+
+    def key_for_folder(self, folder_path):
+        return self.folder_to_key.get(self.normalize_folder(folder_path))
+
+    def entries(self):
+        """Returns (key, data) pairs ordered by key (the metadata file stem)."""
+        return [(key, self.records[key]) for key in sorted(self.records)]
+
+    # --- Mutations ---
+    def file_name_for(self, data):
+        key = self.resolve_key(data)
+        return self.file_names.get(key, f"{key}.json")
+
+    @TRACER.traced("library.save")
+    def save(self, data):
+        """
+        Updates the index and queues data for its metadata file (written in the background by
+        self.writer). Returns the entry key.
+        """
+        file_name = self.file_name_for(data)
+        # Catch an unwritable folder here, where the caller can still report it; later failures
+        # (a full disk, a dropped network share) reach the user through writer.on_failure
+        os.makedirs(self.metadata_dir, exist_ok=True)
+        if not os.access(self.metadata_dir, os.W_OK):
+            raise PermissionError(f"Metadata folder '{self.metadata_dir}' is not writable")
+        self.writer.write(file_name, json.dumps(data, indent=2, ensure_ascii=False))
+        key = self.key_for(data, file_name)
+        self._remember(key, data, file_name, None) # The stat is filled in once the write lands
+        self._snapshot_dirty = True
+        return key
+
+    @TRACER.traced("library.save_many")
+    def save_many(self, entries):
+        """Saves several entries (one file each). Returns their keys in order."""
+        return [self.save(data) for data in entries]
+
+    @TRACER.traced("library.delete")
+    def delete(self, key):
+        """Removes the entry's metadata file and drops it from the index. Returns False if no file existed."""
+        file_name = self.file_names.get(key)
+        self._forget_key(key)
+        if file_name is None:
+            return False
+        self._snapshot_dirty = True
+        existed = self.writer.is_pending(file_name) or os.path.exists(os.path.join(self.metadata_dir, file_name))
+        self.writer.delete(file_name)
+        return existed
+
+    def close(self):
+        """
+        Waits for the queued metadata writes, then brings the snapshot up to date.
+        Returns the metadata file names whose changes could not be written.
+        """
+        unsaved = self.writer.close()
+        if self.loaded and self._snapshot_dirty:
+            self._absorb_writes()
+            if unsaved:
+                self.refresh() # Keep the snapshot to what is actually on disk
+            self.write_snapshot()
+        return unsaved
+
+    # --- Snapshot ---
+    # Layout: header, then an int64 array of (mtime_ns, size) per entry, then every string field of
+    # every entry as one NUL-separated UTF-8 block: file name, key, normalized folder, a kind mask
+    # (one character per SNAPSHOT_FIELDS field: s = string, n = None, - = missing) and the five
+    # values. Entries that don't fit that shape (extra keys, other value types) use the mask "j"
+    # and carry their whole JSON in the first value slot.
+    @TRACER.traced("library.write_snapshot")
+    def write_snapshot(self):
+        """Writes every entry whose file is on disk to the snapshot file (temp file + rename)."""
+        stats = array.array("q")
+        strings = []
+        count = 0
+        for key, data in self.records.items():
+            file_name = self.file_names.get(key)
+            stat = self._file_stats.get(file_name)
+            if stat is None:
+                continue # Not written yet; it will be parsed from its file next time
+            values = [data.get(field) for field in self.SNAPSHOT_FIELDS]
+            if len(data) <= len(values) and all(field in self.SNAPSHOT_FIELDS for field in data) and \
+                    all(value is None or (isinstance(value, str) and "\0" not in value) for value in values):
+                mask = "".join("-" if field not in data else "n" if value is None else "s"
+                               for field, value in zip(self.SNAPSHOT_FIELDS, values))
+                values = [value or "" for value in values]
+            else:
+                mask = "j"
+                values = [json.dumps(data, ensure_ascii=False)] + [""] * (len(self.SNAPSHOT_FIELDS) - 1)
+            strings += [file_name, key, self.normalize_folder(data.get("folder")), mask]
+            strings += values
+            stats.extend(stat)
+            count += 1
+
+        tmp_path = f"{self.snapshot_path}.tmp"
+        try:
+            os.makedirs(self.metadata_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(self.SNAPSHOT_HEADER.pack(self.SNAPSHOT_MAGIC, self.SNAPSHOT_VERSION, count))
+                f.write(stats.tobytes())
+                f.write("\0".join(strings).encode("utf-8", "surrogatepass"))
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"Warning: Could not write library snapshot {self.snapshot_path}: {e}")
+            return False
+        self._snapshot_dirty = False
+        return True
+
+    @TRACER.traced("library.read_snapshot")
+    def _restore_snapshot(self, current_stats):
+        """
+        Fills the index from the snapshot file with every entry whose JSON file still has the same
+        mtime/size; refresh() then parses only the remaining files. A missing or unreadable snapshot
+        is ignored, so loading falls back to the JSON files.
+        """
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                blob = f.read()
+            magic, version, count = self.SNAPSHOT_HEADER.unpack_from(blob)
+            if magic != self.SNAPSHOT_MAGIC or version != self.SNAPSHOT_VERSION:
+                raise ValueError("unknown format")
+            stats = array.array("q")
+            offset = self.SNAPSHOT_HEADER.size
+            stats.frombytes(blob[offset:offset + count * 16])
+            parts = blob[offset + count * 16:].decode("utf-8", "surrogatepass").split("\0")
+            per_entry = 4 + len(self.SNAPSHOT_FIELDS)
+            if len(stats) != count * 2 or (count and len(parts) != count * per_entry):
+                raise ValueError("truncated")
+        except FileNotFoundError:
+            self._snapshot_dirty = True
+            return
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Warning: Ignoring unreadable library snapshot {self.snapshot_path}: {e}")
+            self._snapshot_dirty = True
+            return
+
+        layouts = {} # mask -> [(field, value offset or None for a None value)]
+        restored = 0
+        for index in range(count):
+            base = index * per_entry
+            file_name = parts[base]
+            stat = (stats[2 * index], stats[2 * index + 1])
+            if current_stats.get(file_name) != stat:
+                continue # Changed or deleted since the snapshot; parsed (or dropped) as usual
+            key, folder, mask = parts[base + 1], parts[base + 2], parts[base + 3]
+            if mask == "j":
+                data = json.loads(parts[base + 4])
+            else:
+                layout = layouts.get(mask)
+                if layout is None:
+                    layout = layouts[mask] = [(field, 4 + position if kind == "s" else None)
+                                              for position, (field, kind) in enumerate(zip(self.SNAPSHOT_FIELDS, mask)) if kind != "-"]
+                data = {field: None if offset is None else parts[base + offset] for field, offset in layout}
+            self.records[key] = data
+            self.folder_to_key[folder] = key
+            self.file_names[key] = file_name
+            self._file_keys[file_name] = key
+            self._file_stats[file_name] = stat
+            restored += 1
+        if restored != count:
+            self._snapshot_dirty = True
+
+
+class SqliteLibraryIndex(_LibraryBase):
+    """
+    Single-file SQLite library backend with the same load/save/delete interface as LibraryIndex.
+    Lookups are indexed queries, so they no longer depend on the library size.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS manga (
+            uuid TEXT PRIMARY KEY,
+            folder TEXT NOT NULL,
+            name TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_manga_folder ON manga(folder);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, db_path=LIBRARY_DB_PATH, metadata_dir=METADATA_DIR):
+        self.db_path = db_path
+        self.metadata_dir = metadata_dir # Legacy JSON tree migrated on first load
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._load_lock = threading.Lock()
+        self.loaded = False
+
+    def load(self):
+        """Runs the one-shot JSON migration the first time the database is opened."""
+        with self._load_lock:
+            if self.loaded:
+                return []
+            self.loaded = True
+            with self._lock:
+                migrated = self._conn.execute("SELECT value FROM meta WHERE key = 'migrated_from_json'").fetchone()
+            if migrated:
+                return []
+            return self.import_json_dir(self.metadata_dir)
+
+    def change_token(self):
+        """
+        Counter bumped inside every transaction that changes the library. The file stats of the
+        database and its write-ahead log would also change on checkpoints, which SQLite runs on its own.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _bump_generation(self):
+        """Called inside a write transaction (with self._lock held)."""
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('generation', 1) "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+        )
+
+    def refresh(self):
+        """The database is only changed through this object, so there is nothing to pick up."""
+        return [], [], []
+
+    @TRACER.traced("library.import_json")
+    def import_json_dir(self, metadata_dir):
+        """
+        Imports every metadata/*.json file in a single transaction.
+        Entries whose folder is already in the database are skipped and reported as duplicates.
+        Returns the same issue tuples as LibraryIndex.refresh().
+        """
+        issues = []
+        rows = []
+        if os.path.exists(metadata_dir):
+            for file_name in sorted(os.listdir(metadata_dir)):
+                if not file_name.endswith(".json"): continue
+                file_path = os.path.join(metadata_dir, file_name)
+                try:
+                    with open(file_path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except json.JSONDecodeError:
+                    print(f"Error: Corrupted JSON file detected during import: {file_path}")
+                    issues.append(("corrupted", file_name, file_path))
+                    continue
+                except Exception as e:
+                    print(f"An unexpected error occurred while importing {file_path}: {e}")
+                    continue
+                if not isinstance(data, dict) or not data.get("folder"):
+                    print(f"Warning: JSON file {file_name} is missing 'folder' key. Skipping.")
+                    continue
+                rows.append((self.key_for(data, file_name), data, file_name))
+
+        with self._lock, self._conn:
+            for key, data, file_name in rows:
+                folder = self.normalize_folder(data["folder"])
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO manga (uuid, folder, name, data) VALUES (?, ?, ?, ?)",
+                    (key, folder, data.get("name"), json.dumps(data, ensure_ascii=False))
+                )
+                if cursor.rowcount == 0:
+                    issues.append(("duplicate", file_name, folder))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from_json', ?)", (metadata_dir,)
+            )
+            self._bump_generation()
+        debug_log(f"Imported {len(rows) - len([i for i in issues if i[0] == 'duplicate'])} entries from '{metadata_dir}' into {self.db_path}")
+        return issues
+
+    # --- Lookups ---
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM manga").fetchone()[0]
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM manga WHERE uuid = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def contains_folder(self, folder_path):
+        return self.key_for_folder(folder_path) is not None
+
+    def key_for_folder(self, folder_path):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT uuid FROM manga WHERE folder = ?", (self.normalize_folder(folder_path),)
+            ).fetchone()
+        return row[0] if row else None
+
+    @TRACER.traced("library.entries")
+    def entries(self):
+        """Returns (key, data) pairs ordered by key, matching the JSON backend."""
+        with self._lock:
+            rows = self._conn.execute("SELECT uuid, data FROM manga ORDER BY uuid").fetchall()
+        return [(key, json.loads(data)) for key, data in rows]
+
+    # --- Mutations ---
+    @TRACER.traced("library.save")
+    def save(self, data):
+        key = self.resolve_key(data)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO manga (uuid, folder, name, data) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(uuid) DO UPDATE SET folder = excluded.folder, name = excluded.name, data = excluded.data",
+                (key, self.normalize_folder(data["folder"]), data.get("name"), json.dumps(data, ensure_ascii=False))
+            )
+            self._bump_generation()
+        return key
+
+    @TRACER.traced("library.save_many")
+    def save_many(self, entries):
+        """Saves several entries in a single transaction. Returns their keys in order."""
+        rows = [
+            (self.resolve_key(data), self.normalize_folder(data["folder"]), data.get("name"), json.dumps(data, ensure_ascii=False))
+            for data in entries
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO manga (uuid, folder, name, data) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(uuid) DO UPDATE SET folder = excluded.folder, name = excluded.name, data = excluded.data",
+                rows
+            )
+            self._bump_generation()
+        return [row[0] for row in rows]
+
+    @TRACER.traced("library.delete")
+    def delete(self, key):
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM manga WHERE uuid = ?", (key,))
+            if cursor.rowcount:
+                self._bump_generation()
+        return cursor.rowcount > 0
+
+    def close(self):
+        """
+        Every save is committed before it returns, so there is nothing to wait for; the write-ahead
+        log is folded back into the database file now rather than when the process exits.
+        """
+        try:
+            with self._lock:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            print(f"Warning: Could not checkpoint {self.db_path}: {e}")
+        return []
+
+
+class LibraryLoadTask(QRunnable):
+    """Runs the initial library load off the GUI thread and reports its issues through a signal."""
+
+    def __init__(self, library, loaded_signal):
+        super().__init__()
+        self.library = library
+        self.loaded_signal = loaded_signal
+
+    def run(self):
+        try:
+            issues = self.library.load()
+        except Exception as e:
+            print(f"Error: Could not load the library: {e}")
+            issues = []
+        try:
+            self.loaded_signal.emit(issues)
+        except RuntimeError:
+            pass # The window was closed while the library was loading
+
+
+def open_library():
+    """Returns the library backend selected by the MANGAQ_STORE environment variable ("json" or "sqlite")."""
+    if os.environ.get("MANGAQ_STORE", "json").lower() == "sqlite":
+        return SqliteLibraryIndex(LIBRARY_DB_PATH, METADATA_DIR)
+    return LibraryIndex(METADATA_DIR)
+
+
+class MetadataWatcher(QObject):
+    """
+    Watches the metadata directory for files created, modified or deleted by other programs
+    (sync tools, scripts) and patches the LibraryIndex through refresh_files(), so an event only
+    costs work for the files it touched. Only the directory itself is watched (one system watch
+    however large the library): it reports creates, renames and deletes, after which a background
+    thread lists the directory (names and inode numbers, no stat) and hands the differences to the
+    GUI thread. Edits made in place leave the directory untouched, so that thread also stats every
+    file once per SWEEP_INTERVAL_S, a chunk at a time, handling directory events between chunks.
+    """
+    entries_changed = Signal(list, list, list) # changed keys, removed keys, issues
+    _files_changed = Signal(list) # file names, emitted by the scan thread
+    SWEEP_INTERVAL_S = 10
+    SWEEP_CHUNK = 500 # Files stat-ed between short pauses, so a sweep never competes with the GUI for long
+    SWEEP_PAUSE_S = 0.02
+
+    def __init__(self, library, debounce_ms=300, parent=None):
+        super().__init__(parent)
+        self.library = library
+        os.makedirs(library.metadata_dir, exist_ok=True)
+        self._watcher = QFileSystemWatcher([library.metadata_dir], self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self._request_scan)
+        self._files_changed.connect(self.refresh_files)
+        self._cond = threading.Condition()
+        self._known = {} # file name -> (inode, mtime_ns, size) as last seen by the scan thread
+        self._scan_requested = False
+        self._stopped = False
+        self._thread = None
+
+    def start(self):
+        """Starts following the directory from the library's current state; called once it is loaded."""
+        if self._thread is not None:
+            return
+        # No inodes yet: the first sweep records them, and also catches edits made during the load
+        self._known = {name: (None,) + stat for name, stat in self.library.file_stats().items()}
+        self._thread = threading.Thread(target=self._run, name="MetadataWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def _on_directory_changed(self, *_):
+        self._debounce.start() # Restarting the timer coalesces bursts of events
+
+    def _request_scan(self):
+        metadata_dir = self.library.metadata_dir
+        if os.path.isdir(metadata_dir) and metadata_dir not in self._watcher.directories():
+            self._watcher.addPath(metadata_dir) # Re-arm if the directory was replaced
+        with self._cond:
+            self._scan_requested = True
+            self._cond.notify_all()
+
+    def refresh_files(self, file_names):
+        """Re-reads the given metadata file names (GUI thread) and reports what changed."""
+        if not self.library.loaded:
+            return # Nothing to patch yet; the initial load will pick everything up
+        changed, removed, issues = self.library.refresh_files(file_names)
+        if changed or removed or issues:
+            self.entries_changed.emit(changed, removed, issues)
+
+    def _run(self):
+        next_sweep = 0
+        sweep = [] # File names the current sweep has yet to stat
+        while True:
+            with self._cond:
+                if sweep:
+                    timeout = self.SWEEP_PAUSE_S
+                else:
+                    timeout = max(0, next_sweep - time.monotonic())
+                self._cond.wait_for(lambda: self._scan_requested or self._stopped, timeout)
+                if self._stopped:
+                    return
+                scan, self._scan_requested = self._scan_requested, False
+            file_names = []
+            try:
+                if scan:
+                    file_names += self._scan()
+                if not sweep and time.monotonic() >= next_sweep:
+                    sweep = list(self._known)
+                    sweep.reverse() # Popped from the end, so files are checked in directory order
+                if sweep:
+                    chunk = [sweep.pop() for _ in range(min(self.SWEEP_CHUNK, len(sweep)))]
+                    file_names += self._stat_files(chunk)
+                    if not sweep:
+                        next_sweep = time.monotonic() + self.SWEEP_INTERVAL_S
+            except OSError as e:
+                print(f"Warning: Could not check '{self.library.metadata_dir}' for changes: {e}")
+            if file_names:
+                try:
+                    self._files_changed.emit(file_names)
+                except RuntimeError:
+                    return # The window was closed
+
+    def _scan(self):
+        """Returns the JSON file names added, removed or replaced (new inode) since the last scan."""
+        listing = {}
+        with os.scandir(self.library.metadata_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file():
+                    listing[entry.name] = entry.inode()
+        known = self._known
+        file_names = [name for name in known if name not in listing]
+        for name in file_names:
+            del known[name]
+        new = [name for name, inode in listing.items()
+               if name not in known or known[name][0] not in (None, inode)] # None: not swept yet
+        return file_names + self._stat_files(new, listing)
+
+    def _stat_files(self, file_names, inodes=None):
+        """Stats file_names and returns those that differ from what was last seen."""
+        changed = []
+        known = self._known
+        for name in file_names:
+            previous = known.get(name)
+            try:
+                st = os.stat(os.path.join(self.library.metadata_dir, name))
+            except FileNotFoundError:
+                if previous is not None:
+                    del known[name]
+                    changed.append(name)
+                continue
+            except OSError:
+                continue
+            inode = inodes[name] if inodes is not None else st.st_ino
+            current = (inode, st.st_mtime_ns, st.st_size)
+            if previous is None or previous[1:] != current[1:] or previous[0] not in (None, inode):
+                changed.append(name)
+            known[name] = current
+        return changed
+
+
+# --- Search Index Class ---
+class SearchResults:
+    """
+    Ranked keys of one search, used like a read-only list. The size and membership are known up
+    front, but keys are only put in rank order as far as they are indexed, so showing the first rows
+    of a huge result set never sorts all of it. Each score group is either sorted (small groups) or read off the index's
+    title-ordered list (large ones), which yields its first rows after a short walk.
+    """
+    WALK_RATIO = 32 # Groups larger than 1/WALK_RATIO of the library are walked instead of sorted
+
+    def __init__(self, groups=(), names=None, by_name=()):
+        self._groups = [group for group in groups if group] # key sets, best score first
+        self._remaining = deque(self._groups)
+        self._names = names if names is not None else {}
+        self._by_name = by_name # (title, key) pairs in title order, shared with the index
+        self._ranked = []
+        self._current = None    # iterator over the group being ranked
+        self._size = sum(len(group) for group in self._groups)
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key):
+        return any(key in group for group in self._groups)
+
+    def keys(self):
+        """Every matching key, unordered."""
+        return set().union(*self._groups)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._rank_until(self._size if index.stop is None or index.stop < 0 else index.stop)
+        else:
+            self._rank_until(self._size if index < 0 else index + 1)
+        return self._ranked[index]
+
+    def __iter__(self):
+        position = 0
+        while position < self._size:
+            batch = self[position:position + 1000]
+            if not batch:
+                return
+            yield from batch
+            position += len(batch)
+
+    def _rank_until(self, count):
+        while len(self._ranked) < count:
+            if self._current is None:
+                if not self._remaining:
+                    break
+                self._current = self._rank_group(self._remaining.popleft())
+            batch = list(itertools.islice(self._current, count - len(self._ranked)))
+            if not batch:
+                self._current = None
+                continue
+            self._ranked.extend(batch)
+
+    def _rank_group(self, group):
+        if len(group) * self.WALK_RATIO < len(self._by_name):
+            names = self._names
+            return iter(sorted(group, key=lambda key: (names.get(key, ""), key)))
+        by_name = list(self._by_name) # The index may change while this group is read a batch at a time
+        return (key for _, key in by_name if key in group)
+
+
+class SearchIndex:
+    """
+    In-memory inverted index over entry titles and descriptions.
+    Each word maps to the keys containing it, and each trigram (or 1-2 character prefix) maps to the
+    words containing it, so a query only touches the words and entries it can match.
+    Scoring works on whole sets of keys (one per score), so a query that matches most of the library
+    costs a handful of set operations; ranking within a score is left to SearchResults.
+    Entries are added and removed one at a time, so saves and deletes never rebuild the index.
+    """
+    # Match quality per field: whole word, word prefix, anywhere inside a word
+    NAME_SCORES = (100, 60, 30)
+    DESCRIPTION_SCORES = (10, 6, 3)
+    PHRASE_PREFIX_BONUS = 200 # Title starts with the whole query
+    PHRASE_BONUS = 50         # Title contains the whole query
+    MIN_QUERY_LENGTH = 2      # Shorter queries match nearly everything, so they don't filter
+
+    _WORD_RE = re.compile(r"\w+")
+
+    def __init__(self):
+        self._name_postings = {}        # word -> set of keys with the word in the title
+        self._description_postings = {} # word -> set of keys with the word in the description
+        self._first_words = {}          # word -> set of keys whose title starts with the word
+        self._words = set()             # every indexed word
+        self._trigrams = {}             # trigram -> set of words
+        self._short_prefixes = {}       # 1-2 character prefix -> set of words
+        self._entry_words = {}          # key -> (title words, description words)
+        self._names = {}                # key -> normalized title, for the phrase bonus and tie-breaking
+        self._by_name = []              # (normalized title, key) in title order
+        self._unsorted = []             # (normalized title, key) added since _by_name was last sorted
+
+    @classmethod
+    def tokenize(cls, text):
+        return cls._WORD_RE.findall((text or "").casefold())
+
+    @staticmethod
+    def _grams(word):
+        return {word[i:i + 3] for i in range(len(word) - 2)}
+
+    def __len__(self):
+        return len(self._entry_words)
+
+    def build(self, entries):
+        for key, data in entries:
+            self.add(key, data)
+
+    def add(self, key, data):
+        """Indexes (or re-indexes) one entry."""
+        if key in self._entry_words:
+            self.remove(key)
+        name_tokens = self.tokenize(data.get("name", ""))
+        name_words = tuple(dict.fromkeys(name_tokens))
+        description_words = tuple(dict.fromkeys(self.tokenize(data.get("description", ""))))
+        self._entry_words[key] = (name_words, description_words)
+        name = self._names[key] = " ".join(name_tokens)
+        self._unsorted.append((name, key)) # Placed in _by_name by the next search, in one go
+        if name_tokens:
+            self._first_words.setdefault(name_tokens[0], set()).add(key)
+        for words, postings in ((name_words, self._name_postings), (description_words, self._description_postings)):
+            for word in words:
+                keys = postings.get(word)
+                if keys is not None:
+                    keys.add(key)
+                    continue
+                postings[word] = {key}
+                if word not in self._words:
+                    self._add_word(word)
+
+    def remove(self, key):
+        words = self._entry_words.pop(key, None)
+        if words is None:
+            return
+        name = self._names.pop(key, None)
+        item = (name, key)
+        position = bisect_left(self._by_name, item)
+        if position < len(self._by_name) and self._by_name[position] == item:
+            del self._by_name[position]
+        else:
+            self._unsorted.remove(item)
+        if words[0]:
+            self._discard(self._first_words, name.split(" ", 1)[0], key)
+        for entry_words, postings in zip(words, (self._name_postings, self._description_postings)):
+            for word in entry_words:
+                keys = postings.get(word)
+                if keys is None:
+                    continue
+                keys.discard(key)
+                if not keys:
+                    del postings[word]
+                    if word not in self._name_postings and word not in self._description_postings:
+                        self._drop_word(word)
+
+    def sort_names(self):
+        """Puts titles added since the last search in order; search() does this itself when needed."""
+        if len(self._unsorted) < 64:
+            for item in self._unsorted:
+                insort(self._by_name, item)
+        else:
+            self._by_name.extend(self._unsorted)
+            self._by_name.sort()
+        self._unsorted = []
+
+    def _add_word(self, word):
+        self._words.add(word)
+        for gram in self._grams(word):
+            self._trigrams.setdefault(gram, set()).add(word)
+        for prefix in {word[:1], word[:2]}:
+            self._short_prefixes.setdefault(prefix, set()).add(word)
+
+    def _drop_word(self, word):
+        self._words.discard(word)
+        for gram in self._grams(word):
+            self._discard(self._trigrams, gram, word)
+        for prefix in {word[:1], word[:2]}:
+            self._discard(self._short_prefixes, prefix, word)
+
+    @staticmethod
+    def _discard(index, gram, word):
+        words = index.get(gram)
+        if words is not None:
+            words.discard(word)
+            if not words:
+                del index[gram]
+
+    def _matching_words(self, term):
+        """Returns the indexed words containing term (only words starting with it for 1-2 characters)."""
+        if len(term) < 3:
+            return self._short_prefixes.get(term, set())
+        candidates = None
+        for gram in sorted(self._grams(term), key=lambda g: len(self._trigrams.get(g, ()))):
+            words = self._trigrams.get(gram)
+            if not words:
+                return set()
+            candidates = set(words) if candidates is None else candidates & words
+        return {word for word in candidates if term in word}
+
+    @TRACER.traced("search.query")
+    def search(self, query):
+        """Returns the SearchResults for the entries matching every word of query, best matches first."""
+        terms = list(dict.fromkeys(self.tokenize(query)))
+        if not terms:
+            return SearchResults()
+        levels = None   # [(score, keys)] with disjoint key sets, for the terms seen so far
+        matched = None  # keys that matched every term so far
+        in_names = None # keys whose title matched every term so far
+        starts = set()  # keys whose title starts with the query (single-word queries)
+        ordered_terms = sorted(terms, key=len, reverse=True) # Longer terms match fewer entries; start narrow
+        for position, term in enumerate(ordered_terms):
+            by_quality = ([], [], []) # whole word, word prefix, inside a word
+            for word in self._matching_words(term):
+                by_quality[0 if word == term else 1 if word.startswith(term) else 2].append(word)
+            # Best scores first, so every entry keeps the best score it reaches. Each step is one set
+            # operation over the keys involved, never a loop over them in Python
+            term_levels = []
+            for postings, field_scores in ((self._name_postings, self.NAME_SCORES),
+                                           (self._description_postings, self.DESCRIPTION_SCORES)):
+                for words, score in zip(by_quality, field_scores):
+                    sets = [postings[word] for word in words if word in postings]
+                    if not sets:
+                        continue
+                    if matched is not None:
+                        sets = [matched & keys for keys in sets] # Only entries that matched the previous terms
+                    keys = sets[0] if len(sets) == 1 else set().union(*sets)
+                    keys = keys.difference(*(better for _, better in term_levels)) # Always a new set
+                    if keys:
+                        term_levels.append((score, keys))
+                if postings is self._name_postings:
+                    title_keys = set().union(*(keys for _, keys in term_levels))
+                    in_names = title_keys if in_names is None else in_names & title_keys
+            if len(terms) == 1:
+                starts = set().union(*(self._first_words.get(word, ()) for word in by_quality[0] + by_quality[1]))
+            if levels is None:
+                levels = term_levels
+            else:
+                combined = {}
+                for score, keys in levels:
+                    for term_score, term_keys in term_levels:
+                        both = keys & term_keys
+                        if both:
+                            combined.setdefault(score + term_score, []).append(both)
+                levels = [(score, sets[0] if len(sets) == 1 else set().union(*sets)) for score, sets in combined.items()]
+            if not levels:
+                return SearchResults()
+            if position < len(ordered_terms) - 1:
+                matched = set().union(*(keys for _, keys in levels))
+
+        phrase = " ".join(terms)
+        if len(terms) == 1:
+            contains = in_names # One word: a title matching it contains it
+        else:
+            names = self._names
+            contains = {key for key in in_names if phrase in names[key]}
+            first = self._first_words.get(terms[0], set())
+            starts = {key for key in contains & first if names[key].startswith(phrase)}
+        groups = {}
+        for score, keys in levels:
+            top = keys & starts
+            middle = (keys & contains) - top
+            rest = keys - contains - starts if top or middle else keys
+            for bonus, subset in ((self.PHRASE_PREFIX_BONUS, top), (self.PHRASE_BONUS, middle), (0, rest)):
+                if subset:
+                    group = groups.get(score + bonus)
+                    groups[score + bonus] = subset if group is None else group | subset
+        if self._unsorted:
+            self.sort_names()
+        return SearchResults([groups[score] for score in sorted(groups, reverse=True)], self._names, self._by_name)
+
+
+# --- Archive Classes ---
+def is_archive(path):
+    return os.path.splitext(path)[1].lower() in ARCHIVE_EXTENSIONS
+
+
+def split_archive_path(path):
+    """Splits "chapter.cbz::001.jpg" into ("chapter.cbz", "001.jpg"); plain paths give (path, None)."""
+    if path and ARCHIVE_SEPARATOR in path:
+        archive_path, member = path.split(ARCHIVE_SEPARATOR, 1)
+        return archive_path, member
+    return path, None
+
+
+def archive_member_path(archive_path, member):
+    return f"{archive_path}{ARCHIVE_SEPARATOR}{member}"
+
+
+def image_source_exists(path):
+    """os.path.exists() that also understands archive member paths."""
+    archive_path, member = split_archive_path(path)
+    if member is None:
+        return os.path.exists(path)
+    try:
+        return ArchiveReader.open(archive_path).has_member(member)
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+
+def open_image_reader(path):
+    """Returns a QImageReader for an image file or an archive member path."""
+    archive_path, member = split_archive_path(path)
+    if member is None:
+        return QImageReader(path)
+    try:
+        data = ArchiveReader.open(archive_path).read(member)
+    except (OSError, KeyError, zipfile.BadZipFile, RuntimeError) as e:
+        print(f"Warning: Could not read {member} from {archive_path}: {e}")
+        return QImageReader()
+    buffer = QBuffer()
+    buffer.setData(QByteArray(data))
+    buffer.open(QIODevice.ReadOnly)
+    reader = QImageReader(buffer)
+    reader.buffer = buffer # The device must outlive the reader
+    return reader
+
+
+def first_archive_page(archive_path):
+    """Returns the member path of the first page in an archive, or None."""
+    try:
+        members = ArchiveReader.open(archive_path).image_members
+    except (OSError, zipfile.BadZipFile) as e:
+        print(f"Warning: Could not open archive {archive_path}: {e}")
+        return None
+    return archive_member_path(archive_path, members[0]) if members else None
+
+
+class ArchiveReader:
+    """
+    Read-only access to a CBZ/ZIP archive without extracting it.
+    The central directory is parsed once when the archive is opened, and readers are cached per
+    file until its mtime/size changes. The file is memory-mapped: uncompressed members (the usual
+    case for CBZ) are sliced straight out of the mapping, compressed ones go through zipfile.
+    """
+    _cache = OrderedDict() # absolute path -> ArchiveReader, most recently used last
+    _cache_lock = threading.Lock()
+
+    @TRACER.traced("archive.open")
+    def __init__(self, path):
+        self.path = path
+        st = os.stat(path)
+        self.signature = (st.st_mtime_ns, st.st_size)
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            self._mmap = None # Empty files and some file systems cannot be mapped
+        self._zip = zipfile.ZipFile(self._file) # Reads only the central directory at the end of the file
+        self._members = {info.filename: info for info in self._zip.infolist() if not info.is_dir()}
+        self.image_members = sorted(
+            (name for name in self._members if self._is_page(name)),
+            key=lambda name: [natural_sort_key(part) for part in name.split("/")]
+        )
+
+    @classmethod
+    def open(cls, path):
+        """Returns a reader for path, reusing the cached one while the file is unchanged."""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        with cls._cache_lock:
+            reader = cls._cache.get(path)
+            if reader is not None and reader.signature == (st.st_mtime_ns, st.st_size):
+                cls._cache.move_to_end(path)
+                return reader
+        reader = cls(path)
+        with cls._cache_lock:
+            cls._cache[path] = reader
+            while len(cls._cache) > ARCHIVE_CACHE_ENTRIES:
+                cls._cache.popitem(last=False) # Closed once the last page read from it finishes
+        return reader
+
+    @staticmethod
+    def _is_page(name):
+        if name.startswith("__MACOSX/") or os.path.basename(name).startswith("."):
+            return False
+        return os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+
+    def has_member(self, member):
+        return member in self._members
+
+    def member_size(self, member):
+        return self._members[member].file_size
+
+    @TRACER.traced("archive.read")
+    def read(self, member):
+        """Returns the bytes of one member. Safe to call from several threads."""
+        info = self._members[member]
+        if self._mmap is not None and info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1:
+            header = info.header_offset
+            if self._mmap[header:header + 4] == b"PK\x03\x04":
+                name_length, extra_length = struct.unpack_from("<HH", self._mmap, header + 26)
+                start = header + 30 + name_length + extra_length
+                return self._mmap[start:start + info.file_size]
+        return self._zip.read(info)
+
+
+# --- Library Scanning Classes ---
+_DIGITS_RE = re.compile(r"(\d+)")
+
+
+def natural_sort_key(name):
+    """Sort key that orders embedded numbers numerically ("ch2" before "ch10"), ignoring case."""
+    return [(0, int(part), "") if part.isdigit() else (1, 0, part) for part in _DIGITS_RE.split(name.casefold()) if part]
+
+
+class LibraryScanTask(QRunnable):
+    """Runs one LibraryScanner walk off the GUI thread."""
+
+    def __init__(self, scanner, root):
+        super().__init__()
+        self.scanner = scanner
+        self.root = root
+
+    def run(self):
+        self.scanner._run(self.root)
+
+
+class LibraryScanner(QObject):
+    """
+    Walks a library root for series folders with a pool of os.scandir() workers.
+    A series is a folder whose sub-folders (chapters) contain images or CBZ/ZIP archives, or a folder
+    directly under the root that contains them itself; archives directly under the root are entries
+    of their own. Other folders are treated as groupings and searched further, up to SCAN_MAX_DEPTH
+    levels. Found entries are plain metadata dicts with an automatically picked cover; nothing is
+    written here.
+    """
+    progress = Signal(int, int, float) # folders scanned, series found, folders per second
+    finished = Signal(list, bool)      # found entries, cancelled
+
+    def __init__(self, workers=SCAN_WORKERS, parent=None):
+        super().__init__(parent)
+        self.workers = workers
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._cancel = threading.Event()
+        self.running = False
+
+    def start(self, root):
+        self._cancel.clear()
+        self.running = True
+        self.pool.start(LibraryScanTask(self, root))
+
+    def cancel(self):
+        self._cancel.set()
+
+    def shutdown(self):
+        self.cancel()
+        self.pool.waitForDone()
+
+    @staticmethod
+    @TRACER.traced("scan.list_dir")
+    def list_dir(path):
+        """Returns (image file names, sub-folder paths, archive file names) for path, or None if it cannot be read."""
+        images, subdirs, archives = [], [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name.startswith("."):
+                        continue # Hidden folders, thumbnail caches, ...
+                    try:
+                        if entry.is_dir():
+                            subdirs.append(entry.path)
+                        elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                            images.append(entry.name)
+                        elif is_archive(entry.name):
+                            archives.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError as e:
+            print(f"Warning: Could not scan {path}: {e}")
+            return None
+        images.sort(key=natural_sort_key)
+        subdirs.sort(key=lambda p: natural_sort_key(os.path.basename(p)))
+        archives.sort(key=natural_sort_key)
+        return images, subdirs, archives
+
+    @staticmethod
+    def pick_cover(folder, listing, chapter_listings=()):
+        """
+        A cover.* image wins, then the first page of the folder, then the first page of the first chapter
+        folder, then the first page of the first archive.
+        """
+        images, _, archives = listing
+        for name in images:
+            if os.path.splitext(name)[0].lower() == "cover":
+                return os.path.join(folder, name)
+        if images:
+            return os.path.join(folder, images[0])
+        for chapter, chapter_listing in chapter_listings:
+            if chapter_listing and chapter_listing[0]:
+                return os.path.join(chapter, chapter_listing[0][0])
+        candidates = [os.path.join(folder, name) for name in archives]
+        for chapter, chapter_listing in chapter_listings:
+            if chapter_listing:
+                candidates.extend(os.path.join(chapter, name) for name in chapter_listing[2])
+        for archive in candidates:
+            page = first_archive_page(archive)
+            if page:
+                return page
+        return None
+
+    @TRACER.traced("scan.run")
+    def _run(self, root):
+        root = os.path.normpath(root)
+        found = []
+        listings = {}  # folder -> (images, subdirs) for folders whose parent is not classified yet
+        waiting = {}   # candidate folder -> number of child listings still outstanding
+        depths = {root: 0}
+        scanned = 0
+        started = last_report = time.perf_counter()
+
+        def classify(folder):
+            """Called once every child of folder is listed: either a series or a grouping to descend into."""
+            children = [(child, listings.pop(child, None)) for child in listings[folder][1]]
+            if folder != root and any(listing and (listing[0] or listing[2]) for _, listing in children):
+                found.append(self._entry(folder, listings.pop(folder), children))
+                return []
+            if folder == root:
+                for name in listings[root][2]: # Archives directly under the root
+                    archive = os.path.join(root, name)
+                    found.append(self._entry(archive, ([], [], []), archive_entry=True))
+            listings.pop(folder)
+            submit = []
+            for child, listing in children:
+                if listing is None:
+                    continue
+                if listing[0] or listing[2]: # Pages or archives directly under the root
+                    found.append(self._entry(child, listing))
+                elif listing[1] and depths[folder] + 1 < SCAN_MAX_DEPTH:
+                    listings[child] = listing
+                    depths[child] = depths[folder] + 1
+                    waiting[child] = len(listing[1])
+                    submit.extend(listing[1])
+            return submit
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.list_dir, root): root}
+            while futures and not self._cancel.is_set():
+                done, _ = wait(futures, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    folder = futures.pop(future)
+                    listing = future.result()
+                    scanned += 1
+                    if folder == root:
+                        if listing is None:
+                            break
+                        listings[root] = listing
+                        waiting[root] = len(listing[1])
+                        to_list = list(listing[1])
+                        candidate = root
+                    else:
+                        listings[folder] = listing
+                        candidate = os.path.dirname(folder)
+                        waiting[candidate] -= 1
+                        to_list = []
+                    if not waiting[candidate]: # Every child of the candidate is listed; decide what it is
+                        del waiting[candidate]
+                        to_list.extend(classify(candidate))
+                    for path in to_list:
+                        futures[executor.submit(self.list_dir, path)] = path
+                now = time.perf_counter()
+                if now - last_report >= 0.1:
+                    last_report = now
+                    self.progress.emit(scanned, len(found), scanned / max(now - started, 1e-6))
+            if self._cancel.is_set():
+                for future in futures:
+                    future.cancel()
+
+        elapsed = time.perf_counter() - started
+        cancelled = self._cancel.is_set()
+        debug_log(f"Scanned {scanned} folders under '{root}' in {elapsed:.2f}s "
+              f"({scanned / max(elapsed, 1e-6):.0f} folders/s), found {len(found)} series{' (cancelled)' if cancelled else ''}")
+        self.running = False
+        self.finished.emit(found, cancelled)
+
+    def _entry(self, folder, listing, chapter_listings=(), archive_entry=False):
+        return {
+            "name": os.path.splitext(os.path.basename(folder))[0] if archive_entry else os.path.basename(folder),
+            "description": "",
+            "cover": first_archive_page(folder) if archive_entry else self.pick_cover(folder, listing, chapter_listings),
+            "folder": folder,
+        }
+
+
+# --- Library Health Check Class ---
+class LibraryHealthCheck(QObject):
+    """
+    Checks that every entry's folder and cover still exist by stat-ing them on a bounded set of daemon
+    threads, so slow network storage is checked in parallel. A stat that takes longer than the timeout
+    is abandoned (its thread is replaced) and its parent directory is stat-ed once more, allowing
+    PROBE_TIMEOUT_FACTOR times the timeout, while the other paths under it wait. If the parent answers
+    (storage that was only slow to wake up), the path is retried once; if not, the path is unreachable
+    and every other path under that parent is left "not checked" without being touched, so a dead mount
+    costs a couple of timeouts instead of one per entry. Problems are kept with the time they were found and saved to HEALTH_CHECK_PATH;
+    results only apply while the entry's folder and cover are unchanged.
+    """
+    progress = Signal(int, int) # paths checked, total paths
+    finished = Signal(int, bool) # entries checked, cancelled
+    _results_ready = Signal(dict, int, bool) # problems by key, entries checked, cancelled (from the check thread)
+
+    STATUS_TEXT = {
+        "missing_folder": "Folder not found",
+        "unreachable": "Folder unreachable",
+        "not_checked": "Not checked (its storage did not respond)",
+        "missing_cover": "Cover not found",
+    }
+    SKIPPED = "skipped" # Path result for paths left unchecked under a directory that did not respond
+    PROBE_TIMEOUT_FACTOR = 4 # Spinning up or remounting a share can take several plain timeouts
+
+    def __init__(self, path=HEALTH_CHECK_PATH, workers=HEALTH_CHECK_WORKERS, timeout=HEALTH_CHECK_TIMEOUT_S, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.results = {}       # key -> {"status", "checked", "folder", "cover"}, problems and unchecked entries only
+        self.checked_at = None  # time.time() of the last completed check
+        self.running = False
+        self._cancel = threading.Event()
+        self._results_ready.connect(self._on_results_ready)
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(saved, dict) and isinstance(saved.get("entries"), dict):
+            self.results = saved["entries"]
+            self.checked_at = saved.get("checked")
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"checked": self.checked_at, "entries": self.results}, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not save the health check results: {e}")
+
+    def result(self, key, data):
+        """Returns the stored problem for the entry, or None if it had none or was edited since."""
+        result = self.results.get(key)
+        if result is None or result["folder"] != data.get("folder") or result["cover"] != data.get("cover"):
+            return None
+        return result
+
+    def start(self, entries):
+        """Checks the (key, data) pairs on background threads; finished() is emitted on the GUI thread."""
+        self._cancel.clear()
+        self.running = True
+        threading.Thread(target=self._run, args=(list(entries),), name="health-check", daemon=True).start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @staticmethod
+    def _stat_path(path):
+        return split_archive_path(path)[0] # Archive member covers: the archive itself
+
+    @staticmethod
+    def _under(path, directories):
+        """Returns the closest ancestor of path that is in directories, or None."""
+        parent = os.path.dirname(path)
+        while parent:
+            if parent in directories:
+                return parent
+            next_parent = os.path.dirname(parent)
+            if next_parent == parent:
+                return None
+            parent = next_parent
+        return None
+
+    @TRACER.traced("health.run")
+    def _run(self, entries):
+        paths = set()
+        for _, data in entries:
+            if data.get("folder"):
+                paths.add(data["folder"])
+            if data.get("cover"):
+                paths.add(self._stat_path(data["cover"]))
+        pending = deque(sorted(paths))
+        total = len(pending)
+        found = {}          # path -> True (exists), False (missing), None (unreachable) or SKIPPED
+        active = {}         # worker thread id -> (path, start time)
+        probing = {}        # directory being stat-ed again after a timeout under it -> start time
+        waiting = {}        # probed directory -> timed-out paths to retry once it answers
+        alive = set()       # probed directories that answered
+        hung = set()        # probed directories that did not answer
+        retried = set()     # paths already retried after a timeout
+        lock = threading.Lock()
+        workers = {"live": 0, "hung": 0}
+        max_hung = self.workers * 3 # Hung threads are abandoned, not reused; stop replacing them past this
+
+        def worker():
+            ident = threading.get_ident()
+            while not self._cancel.is_set():
+                try:
+                    path = pending.popleft()
+                except IndexError:
+                    break
+                with lock:
+                    if self._under(path, hung):
+                        found[path] = self.SKIPPED
+                        continue
+                    wait_for_probe = self._under(path, probing)
+                    if not wait_for_probe:
+                        active[ident] = (path, time.monotonic())
+                if wait_for_probe:
+                    pending.append(path) # Back of the queue until the probe decides
+                    time.sleep(0.01)
+                    continue
+                try:
+                    os.stat(path)
+                    exists = True
+                except (FileNotFoundError, NotADirectoryError):
+                    exists = False
+                except (OSError, ValueError):
+                    exists = None # Permission denied, stale network handle, ...
+                with lock:
+                    if active.pop(ident, None) is None:
+                        return # Timed out meanwhile and already replaced
+                    found[path] = exists
+            with lock:
+                workers["live"] -= 1
+
+        def spawn():
+            workers["live"] += 1
+            threading.Thread(target=worker, name="health-check-worker", daemon=True).start()
+
+        def probe(directory):
+            try:
+                os.stat(directory)
+            except OSError:
+                pass # Answering at all is what counts; a missing path shows up in its own stat
+            with lock:
+                if probing.pop(directory, None) is None:
+                    return # Already given up on
+                alive.add(directory)
+                for path in waiting.pop(directory, []):
+                    pending.append(path)
+
+        def timed_out(path):
+            """Called with the lock held for a path whose stat exceeded the timeout."""
+            directory = os.path.dirname(path)
+            probed = self._under(path, probing)
+            if path in retried or directory in alive or self._under(path, hung):
+                found[path] = None
+            elif probed is not None:
+                waiting[probed].append(path)
+                retried.add(path)
+            else:
+                print(f"Warning: Health check timed out on {path}; checking '{directory}' again")
+                probing[directory] = time.monotonic()
+                waiting[directory] = [path]
+                retried.add(path)
+                threading.Thread(target=probe, args=(directory,), name="health-check-probe", daemon=True).start()
+
+        with lock:
+            for _ in range(min(self.workers, total)):
+                spawn()
+        last_report = 0.0
+        while not self._cancel.is_set():
+            time.sleep(0.02)
+            now = time.monotonic()
+            with lock:
+                for ident, (path, started) in list(active.items()):
+                    if now - started > self.timeout:
+                        del active[ident]
+                        workers["live"] -= 1
+                        workers["hung"] += 1
+                        timed_out(path)
+                        if workers["hung"] <= max_hung:
+                            spawn()
+                for directory, started in list(probing.items()):
+                    if now - started > self.timeout * self.PROBE_TIMEOUT_FACTOR:
+                        print(f"Warning: '{directory}' did not respond; its entries are not checked")
+                        del probing[directory]
+                        hung.add(directory)
+                        for path in waiting.pop(directory):
+                            found[path] = None
+                # Paths waiting on a probe are only settled by its answer (retried) or its timeout (above)
+                if pending and not workers["live"]:
+                    if workers["hung"] <= max_hung:
+                        spawn() # The workers ran out of paths before a probe put some back
+                    else:
+                        for path in pending: # Every worker hung
+                            found.setdefault(path, self.SKIPPED)
+                        pending.clear()
+                done = len(found)
+            if done >= total:
+                break
+            if now - last_report >= 0.1:
+                last_report = now
+                self._emit(self.progress, done, total)
+
+        cancelled = self._cancel.is_set()
+        results = {}
+        if not cancelled:
+            checked = time.time()
+            for key, data in entries:
+                folder, cover = data.get("folder"), data.get("cover")
+                folder_found = found.get(folder) if folder else False
+                if folder_found is None:
+                    status = "unreachable"
+                elif folder_found is self.SKIPPED:
+                    status = "not_checked"
+                elif not folder_found:
+                    status = "missing_folder"
+                elif cover and found.get(self._stat_path(cover)) is False:
+                    status = "missing_cover"
+                else:
+                    continue
+                results[key] = {"status": status, "checked": checked, "folder": folder, "cover": cover}
+        self._emit(self._results_ready, results, len(entries), cancelled)
+
+    @staticmethod
+    def _emit(signal, *args):
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            pass # The window was closed while the check was running
+
+    def _on_results_ready(self, results, checked, cancelled):
+        self.running = False
+        if not cancelled:
+            self.results = results
+            self.checked_at = time.time()
+            self._save()
+        self.finished.emit(checked, cancelled)
+
+
+# --- Series Manifest Class ---
+class ManifestStore:
+    """
+    Per-series index of chapters and pages, stored as metadata/manifests/<key>.json.
+    A manifest records every folder it walked with its mtime (and every archive with its mtime and
+    size); it is reused as long as none of those changed (adding, removing or renaming pages or
+    chapters touches them), so opening a series costs one stat() per folder instead of a directory
+    walk and an image header per page.
+    """
+    VERSION = 2
+
+    def __init__(self, manifest_dir=MANIFEST_DIR, cache_entries=MANIFEST_CACHE_ENTRIES):
+        self.manifest_dir = manifest_dir
+        self.cache_entries = cache_entries
+        self._cache = OrderedDict() # key -> manifest, most recently used last
+        self._lock = threading.Lock()
+
+    def path_for(self, key):
+        return os.path.join(self.manifest_dir, f"{key}.json")
+
+    # --- Building ---
+    @staticmethod
+    @TRACER.traced("manifest.build")
+    def build(folder):
+        """
+        Walks folder once and returns its manifest. Chapters and pages are in natural order.
+        CBZ/ZIP files become chapters too (folder may itself be an archive); only their central
+        directory is read, so archive pages are recorded without dimensions (0 x 0).
+        """
+        folder = os.path.normpath(folder)
+        dirs = {}
+        archives = {} # archive path relative to folder ("" for an archive entry) -> [mtime_ns, size]
+        chapters = [] # (sort key, chapter)
+        if os.path.isfile(folder) and is_archive(folder):
+            ManifestStore._add_archive(chapters, archives, folder, "")
+        stack = [("", 0)] if os.path.isdir(folder) else []
+        while stack:
+            rel, depth = stack.pop()
+            path = os.path.join(folder, rel) if rel else folder
+            images, subdirs, archive_names = [], [], []
+            try:
+                mtime = os.stat(path).st_mtime_ns
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.name.startswith("."):
+                            continue
+                        if entry.is_dir():
+                            subdirs.append(entry.name)
+                        elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                            if not rel and os.path.splitext(entry.name)[0].lower() == "cover":
+                                continue # A series-level cover.* is not a page
+                            images.append((entry.name, entry.stat().st_size))
+                        elif is_archive(entry.name):
+                            archive_names.append(entry.name)
+            except OSError as e:
+                print(f"Warning: Could not index {path}: {e}")
+                continue
+            dirs[rel or "."] = mtime
+            if images:
+                images.sort(key=lambda item: natural_sort_key(item[0]))
+                pages = []
+                for name, size in images:
+                    dimensions = QImageReader(os.path.join(path, name)).size() # Reads the header only
+                    pages.append({
+                        "name": name, "bytes": size,
+                        "width": max(dimensions.width(), 0), "height": max(dimensions.height(), 0),
+                    })
+                # Loose pages in the series folder sort first (empty key), then chapters by natural path order
+                chapters.append(([natural_sort_key(part) for part in rel.split(os.sep) if part], {
+                    "name": rel.replace(os.sep, " / ") if rel else os.path.basename(folder),
+                    "path": rel,
+                    "pages": pages,
+                }))
+            for name in archive_names:
+                ManifestStore._add_archive(chapters, archives, folder, os.path.join(rel, name) if rel else name)
+            if depth < MANIFEST_MAX_DEPTH:
+                stack.extend((os.path.join(rel, name) if rel else name, depth + 1) for name in subdirs)
+
+        chapters = [chapter for _, chapter in sorted(chapters, key=lambda item: item[0])]
+        return {
+            "version": ManifestStore.VERSION,
+            "folder": folder,
+            "dirs": dirs,
+            "archives": archives,
+            "chapters": chapters,
+            "page_count": sum(len(chapter["pages"]) for chapter in chapters),
+            "total_bytes": sum(page["bytes"] for chapter in chapters for page in chapter["pages"]),
+        }
+
+    @staticmethod
+    def _add_archive(chapters, archives, folder, rel):
+        """Adds one archive's chapters (one per folder inside it) to chapters."""
+        path = os.path.join(folder, rel) if rel else folder
+        try:
+            reader = ArchiveReader.open(path)
+        except (OSError, zipfile.BadZipFile) as e:
+            print(f"Warning: Could not index archive {path}: {e}")
+            return
+        archives[rel] = list(reader.signature)
+        base_key = [natural_sort_key(part) for part in rel.split(os.sep) if part]
+        base_name = os.path.splitext(rel)[0].replace(os.sep, " / ") if rel else ""
+        groups = OrderedDict() # folder inside the archive -> members, already in natural order
+        for member in reader.image_members:
+            groups.setdefault(member.rpartition("/")[0], []).append(member)
+        for inner, members in groups.items():
+            inner_name = inner.replace("/", " / ")
+            name = " / ".join(part for part in (base_name, inner_name) if part)
+            chapters.append((base_key + [natural_sort_key(part) for part in inner.split("/") if part], {
+                "name": name or os.path.splitext(os.path.basename(path))[0],
+                "path": rel,
+                "archive": True,
+                "pages": [{"name": member, "bytes": reader.member_size(member), "width": 0, "height": 0} for member in members],
+            }))
+
+    @staticmethod
+    def page_path(manifest, chapter, page):
+        """Returns the file path, or archive member path, of a page."""
+        path = os.path.join(manifest["folder"], chapter["path"]) if chapter["path"] else manifest["folder"]
+        if chapter.get("archive"):
+            return archive_member_path(path, page["name"])
+        return os.path.join(path, page["name"])
+
+    @staticmethod
+    def is_fresh(manifest, folder):
+        """True if no folder or archive the manifest read has changed since it was built."""
+        if manifest.get("version") != ManifestStore.VERSION or manifest.get("folder") != os.path.normpath(folder):
+            return False
+        for rel, mtime in manifest.get("dirs", {}).items():
+            try:
+                if os.stat(os.path.join(folder, rel)).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        for rel, signature in manifest.get("archives", {}).items():
+            try:
+                st = os.stat(os.path.join(folder, rel) if rel else folder)
+            except OSError:
+                return False
+            if [st.st_mtime_ns, st.st_size] != signature:
+                return False
+        return True
+
+    # --- Storage ---
+    @TRACER.traced("manifest.read")
+    def _read(self, key):
+        try:
+            with open(self.path_for(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable manifest for {key}: {e}")
+            return None
+
+    @TRACER.traced("manifest.write")
+    def _write(self, key, manifest):
+        path = self.path_for(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.manifest_dir, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not store manifest {path}: {e}")
+
+    def _remember(self, key, manifest):
+        with self._lock:
+            self._cache[key] = manifest
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+
+    def get(self, key, folder):
+        """Returns the manifest for the series in folder, rebuilding it only if a folder changed."""
+        with self._lock:
+            manifest = self._cache.get(key)
+        if manifest is None:
+            manifest = self._read(key)
+        if manifest is None or not self.is_fresh(manifest, folder):
+            manifest = self.build(folder)
+            self._write(key, manifest)
+        self._remember(key, manifest)
+        return manifest
+
+    def peek(self, key):
+        """Returns the last stored manifest without checking the folders or building one."""
+        with self._lock:
+            manifest = self._cache.get(key)
+        if manifest is None:
+            manifest = self._read(key)
+            if manifest is not None:
+                self._remember(key, manifest)
+        return manifest
+
+    def delete(self, key):
+        with self._lock:
+            self._cache.pop(key, None)
+        try:
+            os.remove(self.path_for(key))
+        except OSError:
+            pass
+
+
+# --- Cover Loading Classes ---
+def cover_tier(size, device_pixel_ratio=1.0):
+    """Returns the smallest COVER_TIERS entry that covers size in device pixels, or the largest tier."""
+    width = size.width() * device_pixel_ratio
+    height = size.height() * device_pixel_ratio
+    for tier in COVER_TIERS:
+        if tier.width() >= width and tier.height() >= height:
+            return tier
+    return COVER_TIERS[-1]
+
+
+@TRACER.traced("image.decode")
+def read_scaled_image(path, target):
+    """
+    Decodes the image at path (a file or an archive member) to fit target, scaling while decoding
+    instead of decoding at full size and scaling afterwards: JPEG decoders skip most of the full-size
+    work and SVGs are rendered straight at the target size. Raster images smaller than target are
+    returned as they are. Returns a null QImage on failure.
+    """
+    reader = open_image_reader(path)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    vector = bytes(reader.format()) in (b"svg", b"svgz")
+    if size.isValid() and target.isValid() and (vector or size.width() > target.width() or size.height() > target.height()):
+        reader.setScaledSize(size.scaled(target, Qt.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        print(f"Warning: Could not decode {path}: {reader.errorString()}")
+    elif TRACER.enabled and size.isValid():
+        # Pixels a full decode would have produced vs. pixels actually decoded
+        TRACER.count("image.decode", images=1, source_pixels=size.width() * size.height(),
+                     decoded_pixels=image.width() * image.height())
+    return image
+
+
+class ThumbnailCache:
+    """
+    On-disk cache of pre-scaled cover thumbnails, keyed by cover path + mtime + size + target dimensions.
+    The directory is kept under a byte budget by evicting the least recently used files. Thread-safe.
+    """
+
+    def __init__(self, cache_dir=THUMBNAIL_CACHE_DIR, max_bytes=THUMBNAIL_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict() # file name -> size in bytes, least recently used first
+        self._lock = threading.Lock()
+        self._scanned = False
+
+    @staticmethod
+    def source_signature(path):
+        """
+        Returns (absolute path, mtime_ns, size) of the source cover, or None if it is missing.
+        For an archive member the archive's own mtime and size are used.
+        """
+        archive_path, member = split_archive_path(path)
+        try:
+            st = os.stat(archive_path)
+        except (OSError, TypeError):
+            return None
+        if member is not None:
+            return archive_member_path(os.path.abspath(archive_path), member), st.st_mtime_ns, st.st_size
+        return os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+    @staticmethod
+    def key(signature, size):
+        path, mtime_ns, file_size = signature
+        raw = f"{path}|{mtime_ns}|{file_size}|{size.width()}x{size.height()}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest() + ".thumb"
+
+    def _scan_locked(self):
+        """Rebuilds the LRU order from file mtimes (touched on every hit) the first time the cache is used."""
+        self._scanned = True
+        os.makedirs(self.cache_dir, exist_ok=True)
+        found = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".thumb"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                found.append((st.st_mtime_ns, entry.name, st.st_size))
+        for _, name, size in sorted(found):
+            self._entries[name] = size
+            self.total_bytes += size
+
+    @TRACER.traced("thumbnail.read")
+    def get(self, key):
+        """Returns the cached QImage for key, or None on a miss."""
+        path = os.path.join(self.cache_dir, key)
+        with self._lock:
+            if not self._scanned:
+                self._scan_locked()
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+        image = QImage(path)
+        if image.isNull():
+            with self._lock:
+                self.total_bytes -= self._entries.pop(key, 0)
+            return None
+        try:
+            os.utime(path, None) # Persist the recency for the next session's LRU order
+        except OSError:
+            pass
+        return image
+
+    @TRACER.traced("thumbnail.write")
+    def put(self, key, image):
+        path = os.path.join(self.cache_dir, key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with self._lock:
+            if not self._scanned:
+                self._scan_locked()
+        # JPEG keeps thumbnails small; covers with transparency need PNG
+        if not image.save(tmp_path, "PNG" if image.hasAlphaChannel() else "JPG", 90):
+            return
+        try:
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            print(f"Warning: Could not store thumbnail {path}: {e}")
+            return
+        with self._lock:
+            self.total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict_locked()
+
+    def _evict_locked(self):
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+
+
+
+class CoverPixmapCache:
+    """
+    In-memory cache of cover pixmaps shared by the library views, kept under a byte budget.
+    The least recently used covers are evicted first and the ones currently on screen never are
+    (see set_visible()), so the budget can only be exceeded by a single screenful. An evicted cover
+    is simply loaded again from the thumbnail cache when it is scrolled back into view. Counts hits, misses and evictions for tuning the budget.
+    GUI thread only, like the pixmaps it holds.
+    """
+
+    def __init__(self, max_bytes=COVER_PIXMAP_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict() # (entry key, cover path, width, height) -> (pixmap, bytes), least recently used first
+        self._visible = set()         # entry keys whose covers are on screen
+
+    @staticmethod
+    def _pixmap_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def find(self, cache_key, count=True):
+        """Returns the cached pixmap or None. Lookups with count=False don't touch the counters."""
+        entry = self._entries.get(cache_key)
+        if entry is None:
+            if count:
+                self.misses += 1
+            return None
+        self._entries.move_to_end(cache_key)
+        if count:
+            self.hits += 1
+        return entry[0]
+
+    def insert(self, cache_key, pixmap):
+        size = self._pixmap_bytes(pixmap)
+        old = self._entries.pop(cache_key, None)
+        if old is not None:
+            self.total_bytes -= old[1]
+        self._entries[cache_key] = (pixmap, size)
+        self.total_bytes += size
+        self._evict()
+
+    def remove(self, cache_key):
+        entry = self._entries.pop(cache_key, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+    def set_visible(self, keys):
+        """Marks the entries on screen; their covers are never evicted."""
+        self._visible = set(keys)
+
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def _evict(self):
+        if self.total_bytes <= self.max_bytes:
+            return
+        for cache_key in list(self._entries):
+            if self.total_bytes <= self.max_bytes:
+                return
+            if cache_key[0] not in self._visible:
+                self.total_bytes -= self._entries.pop(cache_key)[1]
+                self.evictions += 1
+        # Anything left over budget is on screen; evicting it would only make the view reload it at once
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "pixmaps": len(self._entries),
+            "bytes": self.total_bytes,
+            "budget_bytes": self.max_bytes,
+        }
+
+    def summary(self):
+        stats = self.stats()
+        return (f"Cover pixmap cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions, "
+                f"{stats['pixmaps']} pixmaps in {stats['bytes'] / (1024 * 1024):.1f} of {stats['budget_bytes'] / (1024 * 1024):.0f} MB")
+
+
+class CoverDecodeTask(QRunnable):
+    """Decodes one cover image on a worker thread and hands the QImage back to the CoverLoader."""
+
+    def __init__(self, loader, generation, key, path, size):
+        super().__init__()
+        self.loader = loader
+        self.generation = generation
+        self.key = key
+        self.path = path
+        self.size = size
+
+    def run(self):
+        image = QImage()
+        # Skip the work if the list was rebuilt after this task was queued
+        if self.loader.generation == self.generation:
+            image = self.loader.load_cover(self.path, self.size)
+        self.loader._task_finished.emit(self.generation, self.key, self.size, image)
+
+
+class CoverLoader(QObject):
+    """
+    Decodes covers on a QThreadPool and emits cover_loaded(key, size, image) on the GUI thread,
+    size being the requested size. A null image means the cover could not be loaded. Keys passed to prioritize() are
+    dispatched before the rest of the queue; cancel_all() drops everything still pending.
+    """
+    cover_loaded = Signal(str, QSize, QImage)
+    _task_finished = Signal(int, str, QSize, QImage)
+
+    def __init__(self, thumbnail_cache=None, parent=None):
+        super().__init__(parent)
+        self.thumbnail_cache = thumbnail_cache
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(2, QThreadPool.globalInstance().maxThreadCount() - 1))
+        self.generation = 0
+        self._pending = OrderedDict() # key -> (path, size), in request order
+        self._priority = []      # keys to dispatch first (e.g. the visible viewport)
+        self._in_flight = 0
+        self._task_finished.connect(self._on_task_finished)
+
+    @TRACER.traced("cover.load")
+    def load_cover(self, path, size):
+        """
+        Returns the cover at path scaled to fit size, or a null QImage. Safe to call from worker threads.
+        Thumbnails for every tier in COVER_TIERS are written to the cache whenever the original
+        has to be decoded, so resizing or switching views later never touches the full-size artwork.
+        The original is decoded straight at the largest tier and each smaller tier is scaled from
+        the one above it.
+        """
+        cache = self.thumbnail_cache
+        signature = None
+        if cache is not None:
+            signature = cache.source_signature(path)
+            if signature is None:
+                return QImage()
+            image = cache.get(cache.key(signature, size))
+            if image is not None:
+                return image
+        elif not image_source_exists(path):
+            return QImage()
+
+        targets = sorted(set(COVER_TIERS) | {size}, key=lambda target: target.width() * target.height(), reverse=True)
+        thumb = read_scaled_image(path, targets[0])
+        if thumb.isNull():
+            return QImage()
+
+        result = None
+        for target in targets:
+            if thumb.width() > target.width() or thumb.height() > target.height():
+                with TRACER.span("cover.scale"):
+                    thumb = thumb.scaled(target, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            if cache is not None:
+                cache.put(cache.key(signature, target), thumb)
+            if target == size:
+                result = thumb
+        return result
+
+    def request(self, key, path, size):
+        self._pending[key] = (path, size)
+        self._dispatch()
+
+    def prioritize(self, keys):
+        """Moves the given keys to the front of the queue, keeping their order."""
+        self._priority = [key for key in keys if key in self._pending]
+        self._dispatch()
+
+    def cancel_all(self):
+        """Cancels queued jobs; results of jobs already running are discarded."""
+        self.generation += 1
+        self._pending.clear()
+        self._priority = []
+        self.pool.clear()
+        self._in_flight = 0
+
+    def shutdown(self):
+        """Cancels pending jobs and waits for the running ones, so no worker outlives the window."""
+        self.cancel_all()
+        self.pool.waitForDone()
+
+    def _next_key(self):
+        while self._priority:
+            key = self._priority.pop(0)
+            if key in self._pending:
+                return key
+        return next(iter(self._pending), None)
+
+    def _dispatch(self):
+        while self._in_flight < self.pool.maxThreadCount() and self._pending:
+            key = self._next_key()
+            path, size = self._pending.pop(key)
+            self._in_flight += 1
+            self.pool.start(CoverDecodeTask(self, self.generation, key, path, size))
+
+    def _on_task_finished(self, generation, key, size, image):
+        if generation != self.generation:
+            return # Stale result from before the last cancel_all()
+        self._in_flight -= 1
+        self.cover_loaded.emit(key, size, image)
+        self._dispatch()
 
 
 # --- Notification Popup Class ---
+class _Notification:
+    """One queued message; count > 1 once other messages with the same key were folded into it."""
+    __slots__ = ("key", "message", "summary", "is_error", "duration_ms", "count")
+
+    def __init__(self, key, message, summary, is_error, duration_ms):
+        self.key = key
+        self.message = message
+        self.summary = summary
+        self.is_error = is_error
+        self.duration_ms = duration_ms
+        self.count = 1
+
+    def text(self):
+        if self.count == 1:
+            return self.message
+        if self.summary:
+            return self.summary.format(count=self.count)
+        return f"{self.message} (x{self.count})"
+
+
 class NotificationPopup(QWidget):
+    """
+    Toast in the bottom-right corner of the window. Messages are queued rather than replacing each
+    other: a message with the same summary (or the same text) as one already shown or waiting is
+    folded into it, so a burst becomes e.g. "37 corrupted metadata files", and each message stays up
+    for at least MIN_DISPLAY_MS before the next one replaces it.
+    """
+    MIN_DISPLAY_MS = 1200
+    BASE_STYLE = """
+            color: white;
+            padding: 8px 15px;
+            border-radius: 8px;
+            font-size: 14px;
+        """
+    # Built once: setting the label's style never re-parses a growing stylesheet
+    STYLES = {
+        False: BASE_STYLE + "background-color: #27ae60;", # Green for success
+        True: BASE_STYLE + "background-color: #e74c3c;",  # Red for error
+    }
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowFlags(
@@ -30,27 +2787,58 @@ class NotificationPopup(QWidget):
 
         self.label = QLabel(self)
         self.label.setAlignment(Qt.AlignCenter)
-        self.label.setStyleSheet("""
-            color: white;
-            padding: 8px 15px;
-            border-radius: 8px;
-            font-size: 14px;
-        """)
+        self.label.setStyleSheet(self.BASE_STYLE)
+        self._style_is_error = None # Which of STYLES the label currently has
         self.layout.addWidget(self.label)
 
+        self._current = None         # _Notification on screen
+        self._queue = OrderedDict()  # key -> _Notification waiting to be shown
+        self._shown_at = 0.0         # time.monotonic() when the current message appeared
+
         self.timer = QTimer(self)
         self.timer.setSingleShot(True)
-        # Timer directly hides the widget when it times out
-        self.timer.timeout.connect(self.hide) 
+        # Hides the popup, or moves on to the next queued message
+        self.timer.timeout.connect(self._show_next)
 
         self.hide() # Start hidden
 
-    def show_message(self, message, is_error=False, duration_ms=3000): # Default duration changed to 3 seconds
-        self.label.setText(message)
-        if is_error:
-            self.label.setStyleSheet(self.label.styleSheet() + "background-color: #e74c3c;") # Red for error
+    def show_message(self, message, is_error=False, duration_ms=3000, summary=None): # Default duration changed to 3 seconds
+        """
+        Queues message for display. summary is a format string with a {count} field used when
+        several messages of the same kind arrive together, e.g. "{count} corrupted metadata files".
+        duration_ms=0 keeps the message up until the next one.
+        """
+        key = (summary or message, is_error)
+        current = self._current
+        if current is not None and current.key == key:
+            current.count += 1
+            current.duration_ms = duration_ms
+            self._display(current, restart=False)
+            return
+        pending = self._queue.get(key)
+        if pending is not None:
+            pending.count += 1
+            return
+        self._queue[key] = _Notification(key, message, summary, is_error, duration_ms)
+        if current is None:
+            self._show_next()
         else:
-            self.label.setStyleSheet(self.label.styleSheet() + "background-color: #27ae60;") # Green for success
+            self._start_timer(current) # Cut the current message short, but not below MIN_DISPLAY_MS
+
+    def _show_next(self):
+        if not self._queue:
+            self._current = None
+            self.timer.stop()
+            self.hide()
+            return
+        _, self._current = self._queue.popitem(last=False)
+        self._display(self._current, restart=True)
+
+    def _display(self, notification, restart):
+        self.label.setText(notification.text())
+        if self._style_is_error is not notification.is_error:
+            self.label.setStyleSheet(self.STYLES[notification.is_error])
+            self._style_is_error = notification.is_error
 
         # Position the popup
         self.adjustSize() # Adjust to text content
@@ -63,28 +2851,38 @@ class NotificationPopup(QWidget):
         y = parent_rect.bottom() - self.height() - 20
         self.move(x, y)
 
+        if restart:
+            self._shown_at = time.monotonic()
         self.setWindowOpacity(1.0) # Make it instantly visible (no fade-in)
         self.show()
-
-        # Start the timer to hide the notification after duration_ms
-        if duration_ms > 0:
-            self.timer.start(duration_ms)
-        elif duration_ms == 0:
+        self._start_timer(notification)
+
+    def _start_timer(self, notification):
+        """Runs the timer until the message should go: after its duration, or sooner if others are waiting."""
+        wait_ms = notification.duration_ms if notification.duration_ms > 0 else None
+        if self._queue:
+            shown_ms = (time.monotonic() - self._shown_at) * 1000
+            remaining_ms = max(0, int(self.MIN_DISPLAY_MS - shown_ms))
+            wait_ms = remaining_ms if wait_ms is None else min(wait_ms, remaining_ms)
+        if wait_ms is None:
             self.timer.stop()
+        else:
+            self.timer.start(wait_ms)
 
 
 class FolderDialog(QDialog):
-    def __init__(self, folder_path, manga_data=None, parent=None):
+    def __init__(self, folder_path, manga_data=None, cover_loader=None, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Add Manga Info" if manga_data is None else "Edit Manga Info")
         self.folder_path = folder_path
         self.cover_path = None
+        self.cover_loader = cover_loader # Serves the preview from the cover tiers when given
         self.manga_data = manga_data # This now includes a 'uuid' if present
 
         # Ensure the icons folder path is correct and exists
         self._icons_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons")
         os.makedirs(self._icons_path, exist_ok=True) 
-        print(f"DEBUG: Icons path: {self._icons_path}") # Debug print
+        debug_log(f"Icons path: {self._icons_path}") # Debug print
 
         # Set the dialog's background to match the main app's general theme (e.g., #2e2e2e)
         self.setStyleSheet("background-color: #2e2e2e; color: white;") # Added white color for text
@@ -143,7 +2941,7 @@ class FolderDialog(QDialog):
         metadata_input_layout = QVBoxLayout()
 
         metadata_input_layout.addWidget(QLabel("Title:"))
-        self.name_input = QLineEdit(os.path.basename(self.folder_path))
+        self.name_input = QLineEdit(os.path.splitext(os.path.basename(self.folder_path))[0] if is_archive(self.folder_path) else os.path.basename(self.folder_path))
         # Style QLineEdit for dark theme
         self.name_input.setStyleSheet("""
             QLineEdit {
@@ -185,6 +2983,8 @@ class FolderDialog(QDialog):
             self.name_input.setText(self.manga_data.get("name", ""))
             self.description_input.setText(self.manga_data.get("description", ""))
             self.cover_path = self.manga_data.get("cover")
+        elif is_archive(self.folder_path):
+            self.cover_path = first_archive_page(self.folder_path) # Default to the archive's first page
         
         self._update_cover_preview() # Call new method to set initial state
 
@@ -231,19 +3031,28 @@ class FolderDialog(QDialog):
         self.cover_button.raise_() # Bring button on top of overlay
 
 
+    @TRACER.traced("dialog.cover_preview")
     def _update_cover_preview(self):
-        if self.cover_path and os.path.exists(self.cover_path):
-            pixmap = QPixmap(self.cover_path)
-            if pixmap.isNull():
+        if self.cover_path and image_source_exists(self.cover_path):
+            # Use the nearest cover tier (or decode at the preview's size) rather than the full cover
+            device_pixel_ratio = self.cover_label.devicePixelRatioF()
+            target = self.cover_label.size() * device_pixel_ratio
+            if self.cover_loader is not None:
+                image = self.cover_loader.load_cover(self.cover_path, cover_tier(self.cover_label.size(), device_pixel_ratio))
+            else:
+                image = read_scaled_image(self.cover_path, target)
+            if image.isNull():
                 print(f"ERROR: Could not load pixmap from {self.cover_path}")
                 # Fallback to 'no cover' state if loading fails
                 self.cover_path = None
                 self._update_cover_preview()
                 return
 
-            scaled_pixmap = pixmap.scaled(
-                self.cover_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation
-            )
+            fitted = image.size().scaled(target, Qt.KeepAspectRatio) # Small covers still fill the preview
+            if image.size() != fitted:
+                image = image.scaled(fitted, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+            scaled_pixmap = QPixmap.fromImage(image)
+            scaled_pixmap.setDevicePixelRatio(device_pixel_ratio)
             self.cover_label.setPixmap(scaled_pixmap)
             # Remove border and ensure background is transparent for the image itself
             self.cover_label.setStyleSheet("border: none; background-color: transparent;")
@@ -289,11 +3098,31 @@ class FolderDialog(QDialog):
         self._position_cover_elements() # Re-position after state change
     
     def select_cover(self):
+        if is_archive(self.folder_path) and os.path.isfile(self.folder_path):
+            self.select_archive_cover()
+            return
         file, _ = QFileDialog.getOpenFileName(self, "Select Cover", "", "Images (*.png *.webp *.jpg *.jpeg *.svg)") # Added SVG
         if file:
             self.cover_path = file
             self._update_cover_preview() # Update the preview immediately
 
+    def select_archive_cover(self):
+        """Lets the user pick one of the archive's pages as the cover."""
+        try:
+            members = ArchiveReader.open(self.folder_path).image_members
+        except (OSError, zipfile.BadZipFile) as e:
+            print(f"ERROR: Could not open archive {self.folder_path}: {e}")
+            return
+        if not members:
+            return
+        current = split_archive_path(self.cover_path)[1] if self.cover_path else None
+        member, ok = QInputDialog.getItem(
+            self, "Select Cover", "Page:", members, members.index(current) if current in members else 0, False
+        )
+        if ok and member:
+            self.cover_path = archive_member_path(self.folder_path, member)
+            self._update_cover_preview()
+
     def get_data(self):
         data = {
             "name": self.name_input.text(),
@@ -359,13 +3188,910 @@ class InfoTabWidget(QWidget):
         main_layout.setStretch(main_layout.count() - 1, 1) # Give bottom spacer stretch factor
 
 
+# --- Library View Classes ---
+class LibraryListModel(QAbstractListModel):
+    """
+    List model over the library entries shown on the Entries tab.
+    Covers are requested from the CoverLoader only when data() asks for them, i.e. for rows the
+    view is actually painting, and decoded pixmaps live in the CoverPixmapCache, one per cover
+    tier. While a tier is loading, another cached tier of the same cover stands in for it.
+    Search results are taken FETCH_BATCH rows at a time through canFetchMore()/fetchMore(), so only
+    the part of a large result set the view scrolls to is ever ranked.
+    """
+    KeyRole = Qt.UserRole + 1
+    HealthRole = Qt.UserRole + 2 # Status of the entry's last health check problem, or None
+    FETCH_BATCH = 500
+
+    def __init__(self, cover_loader, manifests=None, pixmap_cache=None, health=None, parent=None):
+        super().__init__(parent)
+        self.cover_loader = cover_loader
+        self.manifests = manifests
+        self.health = health
+        self.pixmap_cache = pixmap_cache if pixmap_cache is not None else CoverPixmapCache()
+        self.cover_loader.cover_loaded.connect(self._on_cover_loaded)
+        self.cover_size = cover_tier(QSize(GRID_MIN_ITEM_WIDTH, GRID_MIN_ITEM_WIDTH * 4 // 3))
+        self._keys = []         # entry keys, kept sorted so rows can be found with a binary search
+        self._records = {}      # key -> metadata dict
+        self._filter_rows = None # key -> row while a search filter is active, else None
+        self._results = None    # SearchResults (or ranked keys) shown while a search filter is active
+        self._result_position = 0 # how far into self._results rows have been taken
+        self._requested = {}    # key -> cover tier with a load in flight
+        self._failed = set()    # keys whose cover could not be loaded
+        self._loading_pixmap = None
+        self._no_cover_pixmap = None
+
+    def set_entries(self, entries):
+        """Replaces the model contents with (key, data) pairs."""
+        self.beginResetModel()
+        self.cover_loader.cancel_all()
+        self._records = dict(entries)
+        self._keys = sorted(self._records)
+        self._filter_rows = None
+        self._results = None
+        self._requested.clear()
+        self._failed.clear()
+        self.endResetModel()
+
+    def set_filter(self, keys):
+        """Shows only keys, in the given (ranked) order, or every entry again when keys is None."""
+        if keys is None and self._filter_rows is None:
+            return
+        self.beginResetModel()
+        self.cover_loader.cancel_all()
+        self._requested.clear()
+        self._results = keys
+        self._result_position = 0
+        if keys is None:
+            self._keys = sorted(self._records)
+            self._filter_rows = None
+        else:
+            self._filter_rows = {}
+            self._keys = self._take_results(self.FETCH_BATCH)
+            self._filter_rows = {key: row for row, key in enumerate(self._keys)}
+        self.endResetModel()
+
+    def _take_results(self, count):
+        """Returns up to count more search results, skipping entries deleted since the search ran."""
+        start = self._result_position
+        keys = self._results[start:start + count]
+        self._result_position += len(keys)
+        return [key for key in keys if key in self._records and key not in self._filter_rows]
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._results is not None and self._result_position < len(self._results)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        keys = self._take_results(self.FETCH_BATCH)
+        if not keys:
+            return
+        row = len(self._keys)
+        self.beginInsertRows(QModelIndex(), row, row + len(keys) - 1)
+        self._keys.extend(keys)
+        self._filter_rows.update((key, row + offset) for offset, key in enumerate(keys))
+        self.endInsertRows()
+
+    def set_cover_size(self, size):
+        """
+        Switches the default cover tier returned for Qt.DecorationRole (grid vs list view, icon size).
+        Resizes within the same tier keep the in-flight cover loads; only a new tier cancels them.
+        """
+        if size == self.cover_size:
+            return
+        self.cover_size = size
+        self.cover_loader.cancel_all()
+        self._requested.clear()
+        if self._keys:
+            self.dataChanged.emit(self.index(0), self.index(len(self._keys) - 1), [Qt.DecorationRole])
+
+    def row_of(self, key):
+        if self._filter_rows is not None:
+            return self._filter_rows.get(key)
+        row = bisect_left(self._keys, key)
+        return row if row < len(self._keys) and self._keys[row] == key else None
+
+    def upsert_entry(self, key, data):
+        """Inserts a new row in sorted position, or updates the existing row for key."""
+        row = self.row_of(key)
+        if row is None and self._filter_rows is not None:
+            self._records[key] = data # Hidden by the search; the caller re-runs it to place the entry
+            return
+        if row is None:
+            row = bisect_left(self._keys, key)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._keys.insert(row, key)
+            self._records[key] = data
+            self.endInsertRows()
+            return
+        self._forget_cover(key, self._records[key].get("cover"))
+        self._records[key] = data
+        self._failed.discard(key)
+        self._requested.pop(key, None)
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def remove_entry(self, key):
+        row = self.row_of(key)
+        if row is None:
+            self._records.pop(key, None) # May still be held while hidden by the search filter
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._keys[row]
+        data = self._records.pop(key)
+        if self._filter_rows is not None:
+            self._filter_rows = {key: row for row, key in enumerate(self._keys)}
+        self.endRemoveRows()
+        self._forget_cover(key, data.get("cover"))
+        self._failed.discard(key)
+        self._requested.pop(key, None)
+
+    def key_at(self, row):
+        return self._keys[row] if 0 <= row < len(self._keys) else None
+
+    def record(self, key):
+        return self._records.get(key)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._keys)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        key = self._keys[index.row()]
+        data = self._records[key]
+        if role == Qt.DisplayRole:
+            return data.get("name") or os.path.basename(data.get("folder", ""))
+        if role == Qt.DecorationRole:
+            # Not counted: the delegate's own cover_pixmap() lookup is the one that gets painted
+            return self._cover_pixmap(key, data, self.cover_size, count=False)
+        if role == Qt.ToolTipRole:
+            return self._tooltip(key, data)
+        if role == Qt.UserRole:
+            return data
+        if role == self.KeyRole:
+            return key
+        if role == self.HealthRole:
+            result = self.health.result(key, data) if self.health is not None else None
+            return result["status"] if result else None
+        return None
+
+    def _tooltip(self, key, data):
+        name = data.get("name") or os.path.basename(data.get("folder", ""))
+        result = self.health.result(key, data) if self.health is not None else None
+        if result:
+            checked = time.strftime("%Y-%m-%d %H:%M", time.localtime(result["checked"]))
+            name = f"{name}\n{LibraryHealthCheck.STATUS_TEXT[result['status']]} (checked {checked})"
+        # Only an already stored manifest is used; hovering never walks the series folder
+        manifest = self.manifests.peek(key) if self.manifests is not None else None
+        if not manifest:
+            return name
+        chapters = len(manifest["chapters"])
+        return f"{name}\n{chapters} chapter{'s' if chapters != 1 else ''}, {manifest['page_count']} pages"
+
+    @staticmethod
+    def _cache_key(key, cover_path, tier):
+        return key, cover_path, tier.width(), tier.height()
+
+    def _forget_cover(self, key, cover_path):
+        for tier in COVER_TIERS:
+            self.pixmap_cache.remove(self._cache_key(key, cover_path, tier))
+
+    def cover_pixmap(self, row, tier):
+        """Returns the cover of row at the given tier (see cover_tier()), loading it if needed."""
+        key = self.key_at(row)
+        if key is None:
+            return None
+        return self._cover_pixmap(key, self._records[key], tier)
+
+    def _cover_pixmap(self, key, data, tier, count=True):
+        cover_path = data.get("cover")
+        if not cover_path or key in self._failed:
+            return self.no_cover_pixmap()
+        pixmap = self.pixmap_cache.find(self._cache_key(key, cover_path, tier), count)
+        if pixmap is not None:
+            return pixmap
+        if self._requested.get(key) != tier:
+            self._requested[key] = tier
+            self.cover_loader.request(key, cover_path, tier)
+        # Stand in with another tier while this one loads: larger ones first, they only need shrinking
+        larger = [other for other in COVER_TIERS if other.width() > tier.width()]
+        smaller = [other for other in reversed(COVER_TIERS) if other.width() < tier.width()]
+        for other in larger + smaller:
+            pixmap = self.pixmap_cache.find(self._cache_key(key, cover_path, other), count=False)
+            if pixmap is not None:
+                return pixmap
+        return self.loading_pixmap()
+
+    def _on_cover_loaded(self, key, size, image):
+        if self._requested.get(key) == size:
+            del self._requested[key]
+        row = self.row_of(key)
+        if row is None:
+            return
+        if image.isNull():
+            self._failed.add(key)
+        else:
+            self.pixmap_cache.insert(self._cache_key(key, self._records[key].get("cover"), size), QPixmap.fromImage(image))
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    # Placeholders are drawn once and shared by every row
+    def _placeholder_pixmap(self, text):
+        pixmap = QPixmap(120, 160)
+        pixmap.fill(QColor("#1a1a1a")) # Use a dark color for "No Cover" background matching container
+        if text:
+            painter = QPainter(pixmap)
+            painter.setPen(QColor("lightgray")) # Light text on dark background
+            painter.setFont(QApplication.font())
+            painter.drawText(pixmap.rect(), Qt.AlignCenter, text)
+            painter.end()
+        return pixmap
+
+    def loading_pixmap(self):
+        if self._loading_pixmap is None:
+            self._loading_pixmap = self._placeholder_pixmap("")
+        return self._loading_pixmap
+
+    def no_cover_pixmap(self):
+        if self._no_cover_pixmap is None:
+            self._no_cover_pixmap = self._placeholder_pixmap("No Cover\nAvailable")
+        return self._no_cover_pixmap
+
+
+class CoverItemDelegate(QStyledItemDelegate):
+    """
+    Paints a cover with its title below (grid view) or beside it (list view). The cover tier is
+    picked here from the painted size and the device pixel ratio, so a new icon size or a HiDPI
+    screen just selects another pre-rendered tier.
+    """
+
+    TEXT_HEIGHT = 30 # Room for the title under a grid cover
+    BADGES = { # Health check status -> (text, background, text color)
+        "missing_folder": ("Missing", QColor("#e74c3c"), QColor("white")),
+        "unreachable": ("Unreachable", QColor("#e67e22"), QColor("white")),
+        "not_checked": ("Not checked", QColor("#7f8c8d"), QColor("white")),
+        "missing_cover": ("No cover", QColor("#f1c40f"), QColor("black")),
+    }
+
+    @TRACER.traced("view.paint_item")
+    def paint(self, painter, option, index):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        painter.save()
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+
+        if opt.state & QStyle.State_Selected:
+            painter.fillRect(opt.rect, QColor(58, 114, 210, 128)) # #3a72d2 at 50% like the view buttons
+        elif opt.state & QStyle.State_MouseOver:
+            painter.fillRect(opt.rect, QColor("#404040"))
+
+        icon_size = option.decorationSize # The view's icon size; initStyleOption() replaces it with the pixmap size
+        if opt.decorationPosition == QStyleOptionViewItem.Top: # Grid view
+            icon_rect = QRect(opt.rect.x() + (opt.rect.width() - icon_size.width()) // 2, opt.rect.y(),
+                              icon_size.width(), min(icon_size.height(), opt.rect.height() - self.TEXT_HEIGHT))
+            text_rect = QRect(opt.rect.x(), icon_rect.bottom() + 1, opt.rect.width(), opt.rect.bottom() - icon_rect.bottom())
+            text_flags = Qt.AlignHCenter | Qt.AlignVCenter
+        else: # List view
+            icon_rect = QRect(opt.rect.x() + 5, opt.rect.y() + (opt.rect.height() - icon_size.height()) // 2,
+                              icon_size.width(), icon_size.height())
+            text_rect = QRect(icon_rect.right() + 10, opt.rect.y(), opt.rect.right() - icon_rect.right() - 10, opt.rect.height())
+            text_flags = Qt.AlignLeft | Qt.AlignVCenter
+
+        model = index.model()
+        if hasattr(model, "cover_pixmap"):
+            pixmap = model.cover_pixmap(index.row(), cover_tier(icon_rect.size(), painter.device().devicePixelRatioF()))
+        else:
+            pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None and not pixmap.isNull():
+            target = pixmap.size()
+            if target.width() > icon_rect.width() or target.height() > icon_rect.height():
+                target = target.scaled(icon_rect.size(), Qt.KeepAspectRatio) # Like QIcon: shrink, never enlarge
+            target_rect = QRect(QPoint(0, 0), target)
+            target_rect.moveCenter(icon_rect.center())
+            painter.drawPixmap(target_rect, pixmap)
+            badge = self.BADGES.get(index.data(LibraryListModel.HealthRole))
+            if badge is not None:
+                self._paint_badge(painter, opt, target_rect, badge)
+
+        painter.setPen(QColor("white"))
+        text = opt.fontMetrics.elidedText(opt.text, Qt.ElideRight, text_rect.width())
+        painter.drawText(text_rect, text_flags, text)
+        painter.restore()
+
+    @staticmethod
+    def _paint_badge(painter, opt, cover_rect, badge):
+        """Draws a health check badge over the cover's top-left corner."""
+        text, background, color = badge
+        font = QFont(opt.font)
+        font.setPointSizeF(max(6.0, font.pointSizeF() * 0.8))
+        font.setBold(True)
+        metrics = QFontMetrics(font)
+        rect = QRect(cover_rect.x() + 3, cover_rect.y() + 3, metrics.horizontalAdvance(text) + 8, metrics.height() + 2)
+        rect = rect.intersected(cover_rect)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(background)
+        painter.drawRoundedRect(rect, 3, 3)
+        painter.setFont(font)
+        painter.setPen(color)
+        painter.drawText(rect, Qt.AlignCenter, metrics.elidedText(text, Qt.ElideRight, rect.width() - 4))
+        painter.setFont(opt.font)
+
+    def sizeHint(self, option, index):
+        view = self.parent()
+        if view is not None and view.gridSize().isValid():
+            return view.gridSize()
+        return QSize(option.decorationSize.width(), option.decorationSize.height() + self.TEXT_HEIGHT)
+
+
+class MetadataTableModel(QAbstractTableModel):
+    """
+    Table model for the Metadata tab over the shared in-memory library records.
+    Rows are exposed to the view in FETCH_BATCH chunks through canFetchMore()/fetchMore(),
+    and sorting uses sort keys computed once per entry, so it never re-reads any data. Search
+    results shown in rank order are also taken from the SearchResults a batch at a time; only a
+    column sort needs all of them.
+    """
+    HEADERS = ["Title", "Description"]
+    FETCH_BATCH = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._records = {}     # key -> metadata dict (shared with the library)
+        self._sort_keys = {}   # key -> (title sort key, description sort key)
+        self._order = []       # ascending list of (sort value, key) for the active sort column
+        self._sort_column = -1 # -1 = library order (by key), or search rank while filtered
+        self._filter = None    # key -> search rank while a search filter is active, else None
+        self._results = None   # SearchResults (or ranked keys) the filter is taken from
+        self._result_position = 0 # how far into self._results keys have been taken into the filter
+        self._sort_order = Qt.AscendingOrder
+        self._fetched = 0      # number of rows exposed to the view so far
+
+    @staticmethod
+    def _make_sort_keys(data):
+        return (data.get("name", "Unknown") or "").casefold(), (data.get("description", "") or "").casefold()
+
+    def _sort_value(self, key):
+        if self._sort_column >= 0:
+            return self._sort_keys[key][self._sort_column]
+        return self._filter[key] if self._filter is not None else ""
+
+    def _visible_keys(self):
+        return self._records if self._filter is None else self._filter
+
+    def _position_to_row(self, position):
+        if self._sort_order == Qt.DescendingOrder:
+            return len(self._order) - 1 - position
+        return position
+
+    def set_entries(self, entries):
+        """Replaces the model contents with (key, data) pairs."""
+        self.beginResetModel()
+        self._records = dict(entries)
+        self._sort_keys = {key: self._make_sort_keys(data) for key, data in entries}
+        self._filter = None
+        self._results = None
+        self._order = sorted((self._sort_value(key), key) for key in self._records)
+        self._fetched = 0
+        self.endResetModel()
+
+    def set_filter(self, keys):
+        """Shows only keys, ranked in the given order unless a column sort is active, or every entry when keys is None."""
+        if keys is None and self._filter is None:
+            return
+        self.beginResetModel()
+        self._results = keys
+        self._result_position = 0
+        if keys is not None and self._ranked_lazily():
+            self._filter = {}
+            self._order = []
+            self._take_results(self.FETCH_BATCH)
+        else:
+            self._filter = None
+            if keys is not None:
+                self._filter = {}
+                self._take_results(len(keys))
+            self._order = sorted((self._sort_value(key), key) for key in self._visible_keys())
+        self._fetched = 0
+        self.endResetModel()
+
+    def _ranked_lazily(self):
+        """True while rows follow the search rank, so more of them can be taken as the view scrolls."""
+        return self._sort_column < 0 and self._sort_order == Qt.AscendingOrder
+
+    def _take_results(self, count):
+        """Moves up to count more search results into the filter (and, in rank order, onto the end of _order)."""
+        start = self._result_position
+        keys = self._results[start:start + count]
+        self._result_position += len(keys)
+        append = self._ranked_lazily()
+        for rank, key in enumerate(keys, start):
+            if key in self._records and key not in self._filter:
+                self._filter[key] = rank
+                if append:
+                    self._order.append((rank, key))
+
+    def key_at(self, row):
+        if not 0 <= row < self._fetched:
+            return None
+        return self._order[self._position_to_row(row)][1]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._fetched
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and (self._fetched < len(self._order) or self._has_more_results())
+
+    def _has_more_results(self):
+        return self._results is not None and self._result_position < len(self._results)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        if self._fetched + self.FETCH_BATCH > len(self._order) and self._has_more_results():
+            self._take_results(self.FETCH_BATCH)
+        count = min(self.FETCH_BATCH, len(self._order) - self._fetched)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._fetched, self._fetched + count - 1)
+        self._fetched += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        key = self.key_at(index.row())
+        data = self._records.get(key)
+        if data is None:
+            return None
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            if index.column() == 0:
+                return data.get("name", "Unknown")
+            return data.get("description", "")
+        if role == Qt.UserRole:
+            return data
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self._sort_column = column
+        self._sort_order = order
+        if not self._ranked_lazily() and self._has_more_results():
+            self._take_results(len(self._results)) # A column sort needs every match
+        self._order = sorted((self._sort_value(key), key) for key in self._visible_keys())
+        self.layoutChanged.emit()
+
+    # --- Incremental updates ---
+    def _find_position(self, key):
+        item = (self._sort_value(key), key)
+        position = bisect_left(self._order, item)
+        if position < len(self._order) and self._order[position] == item:
+            return position
+        return None
+
+    def _remove_at(self, position):
+        row = self._position_to_row(position)
+        if row < self._fetched:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._order[position]
+            self._fetched -= 1
+            self.endRemoveRows()
+        else:
+            del self._order[position] # Not fetched by the view yet
+
+    def _insert(self, key):
+        item = (self._sort_value(key), key)
+        position = bisect_left(self._order, item)
+        # Rows count from the other end when sorted descending
+        row = position if self._sort_order == Qt.AscendingOrder else len(self._order) - position
+        if row <= self._fetched:
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._order.insert(position, item)
+            self._fetched += 1
+            self.endInsertRows()
+        else:
+            self._order.insert(position, item)
+
+    def upsert_entry(self, key, data):
+        """Inserts or updates one entry, moving it if its sort position changed."""
+        if self._filter is not None and key not in self._filter:
+            self._records[key] = data # Hidden by the search; the caller re-runs it to place the entry
+            self._sort_keys[key] = self._make_sort_keys(data)
+            return
+        position = self._find_position(key) if key in self._sort_keys else None
+        self._records[key] = data
+        self._sort_keys[key] = self._make_sort_keys(data)
+        if position is not None:
+            if self._order[position][0] == self._sort_value(key):
+                row = self._position_to_row(position)
+                if row < self._fetched:
+                    self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+                return
+            self._remove_at(position)
+        self._insert(key)
+
+    def remove_entry(self, key):
+        if key not in self._sort_keys:
+            return
+        if self._filter is None or key in self._filter:
+            position = self._find_position(key)
+            if position is not None:
+                self._remove_at(position)
+        del self._sort_keys[key]
+        self._records.pop(key, None)
+        if self._filter is not None:
+            self._filter.pop(key, None)
+
+    def sample_column_width(self, column, font_metrics, sample_size=200, minimum=120, maximum=400):
+        """Estimates a column width from a sample of rows instead of measuring every row."""
+        widths = [font_metrics.horizontalAdvance(self.HEADERS[column]) + 30]
+        step = max(1, len(self._order) // sample_size)
+        for position in range(0, len(self._order), step):
+            data = self._records[self._order[position][1]]
+            text = data.get("name", "Unknown") if column == 0 else data.get("description", "")
+            widths.append(font_metrics.horizontalAdvance(text or "") + 20)
+        return max(minimum, min(maximum, max(widths)))
+
+
+# --- Reader Classes ---
+class PageDecodeTask(QRunnable):
+    """Decodes one reader page on a worker thread and hands the QImage back to the PageLoader."""
+
+    def __init__(self, loader, generation, index, path, target):
+        super().__init__()
+        self.loader = loader
+        self.generation = generation
+        self.index = index
+        self.path = path
+        self.target = target
+
+    def run(self):
+        image = QImage()
+        # Skip the work if another series was opened after this task was queued
+        if self.loader.generation == self.generation:
+            image = read_scaled_image(self.path, self.target)
+        self.loader._task_finished.emit(self.generation, self.index, self.target, image)
+
+
+class ManifestTask(QRunnable):
+    """Loads (or builds) a series manifest off the GUI thread for the reader."""
+
+    def __init__(self, reader_view, generation, manifests, key, folder):
+        super().__init__()
+        self.reader_view = reader_view
+        self.generation = generation
+        self.manifests = manifests
+        self.key = key
+        self.folder = folder
+
+    def run(self):
+        try:
+            manifest = self.manifests.get(self.key, self.folder)
+        except Exception as e:
+            print(f"Error: Could not index series folder {self.folder}: {e}")
+            manifest = None
+        self.reader_view._manifest_loaded.emit(self.generation, manifest)
+
+
+class PageLoader(QObject):
+    """
+    Decodes reader pages on a QThreadPool, already scaled to the viewport.
+    Pixmaps are kept for a window of `prefetch` pages on each side of the current page (a ring
+    buffer that slides with the reader), so turning to a neighbouring page needs no decoding.
+    The current page is always dispatched first, then its neighbours outwards, forward first.
+    """
+    page_ready = Signal(int)
+    _task_finished = Signal(int, int, QSize, QImage)
+
+    def __init__(self, prefetch=READER_PREFETCH, parent=None):
+        super().__init__(parent)
+        self.prefetch = prefetch
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(2, min(4, QThreadPool.globalInstance().maxThreadCount())))
+        self.generation = 0
+        self.paths = []
+        self.current = 0
+        self.target = QSize()
+        self.device_pixel_ratio = 1.0
+        self._pixmaps = {}    # page index -> QPixmap, only inside the window
+        self._fresh = set()   # pages decoded at the current target size
+        self._failed = set()  # pages that could not be decoded
+        self._in_flight = {}  # page index -> target size being decoded
+        self._task_finished.connect(self._on_task_finished)
+
+    def set_pages(self, paths):
+        """Starts a new series; everything queued or cached for the previous one is dropped."""
+        self.generation += 1
+        self.pool.clear()
+        self.paths = list(paths)
+        self.current = 0
+        self._pixmaps.clear()
+        self._fresh.clear()
+        self._failed.clear()
+        self._in_flight.clear()
+        self._dispatch()
+
+    def clear(self):
+        self.set_pages([])
+
+    def shutdown(self):
+        self.clear()
+        self.pool.waitForDone()
+
+    def set_target_size(self, size, device_pixel_ratio=1.0):
+        """Re-decodes the window for a new viewport size (in device pixels); old pixmaps are shown scaled until then."""
+        if size == self.target:
+            return
+        self.target = QSize(size)
+        self.device_pixel_ratio = device_pixel_ratio
+        self._fresh.clear()
+        self._dispatch()
+
+    def set_current(self, index):
+        self.current = index
+        window = set(self._window())
+        for stale in [i for i in self._pixmaps if i not in window]:
+            del self._pixmaps[stale]
+            self._fresh.discard(stale)
+        self._dispatch()
+
+    def pixmap(self, index):
+        return self._pixmaps.get(index)
+
+    def failed(self, index):
+        return index in self._failed
+
+    def _window(self):
+        """Page indices to keep decoded, in dispatch order: current, next, previous, next + 1, ..."""
+        order = [self.current]
+        for distance in range(1, self.prefetch + 1):
+            order.extend((self.current + distance, self.current - distance))
+        return [i for i in order if 0 <= i < len(self.paths)]
+
+    def _dispatch(self):
+        if not self.target.isValid() or self.target.isEmpty():
+            return
+        for index in self._window():
+            if len(self._in_flight) >= self.pool.maxThreadCount():
+                return
+            if index in self._fresh or index in self._failed or index in self._in_flight:
+                continue # Pages still decoding at an old size are re-requested when they finish
+            self._in_flight[index] = QSize(self.target)
+            self.pool.start(PageDecodeTask(self, self.generation, index, self.paths[index], QSize(self.target)))
+
+    def _on_task_finished(self, generation, index, target, image):
+        if generation != self.generation:
+            return # Stale result from a previously opened series
+        self._in_flight.pop(index, None)
+        if image.isNull():
+            self._failed.add(index) # Not retried until the series is reopened
+            self.page_ready.emit(index)
+        elif abs(index - self.current) <= self.prefetch:
+            if target == self.target or index not in self._pixmaps:
+                pixmap = QPixmap.fromImage(image) # Converted once here, so a page turn is only a swap
+                pixmap.setDevicePixelRatio(self.device_pixel_ratio)
+                self._pixmaps[index] = pixmap
+            if target == self.target:
+                self._fresh.add(index)
+            self.page_ready.emit(index)
+        self._dispatch()
+
+
+class PageCanvas(QWidget):
+    """Paints the current page centered on a black background; clicks on either half turn pages."""
+    clicked = Signal(bool) # True for the right half
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pixmap = None
+        self.message = ""
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setFocusPolicy(Qt.NoFocus)
+
+    def set_pixmap(self, pixmap, message=""):
+        self.pixmap = pixmap
+        self.message = message
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("black"))
+        if self.pixmap is not None and not self.pixmap.isNull():
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            # A decoded page already fits; pages from before a resize are scaled until re-decoded
+            size = self.pixmap.deviceIndependentSize().toSize().scaled(self.size(), Qt.KeepAspectRatio)
+            if size.width() > self.pixmap.deviceIndependentSize().width():
+                size = self.pixmap.deviceIndependentSize().toSize()
+            target = QRect(QPoint(0, 0), size)
+            target.moveCenter(self.rect().center())
+            painter.drawPixmap(target, self.pixmap)
+        elif self.message:
+            painter.setPen(QColor("lightgray"))
+            painter.drawText(self.rect(), Qt.AlignCenter, self.message)
+        painter.end()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.clicked.emit(event.position().x() >= self.width() / 2)
+        super().mousePressEvent(event)
+
+
+class ReaderView(QWidget):
+    """
+    In-app page reader shown in the main QStackedWidget.
+    The series manifest is loaded off the GUI thread, and pages come from a PageLoader that
+    decodes and prefetches them on worker threads.
+    """
+    closed = Signal()
+    error = Signal(str)
+    _manifest_loaded = Signal(int, object)
+
+    def __init__(self, manifests, parent=None):
+        super().__init__(parent)
+        self.manifests = manifests
+        self.generation = 0
+        self.pages = []    # (chapter name, absolute path) in reading order
+        self.current = 0
+        self.title = ""
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.setStyleSheet("background-color: #1e1e1e; color: white;")
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        # --- Reader header: back button, title and position ---
+        header = QHBoxLayout()
+        header.setContentsMargins(10, 5, 10, 5)
+        header.setSpacing(10)
+        self.btn_back = QPushButton("Back to Library")
+        self.btn_back.setFocusPolicy(Qt.NoFocus)
+        self.btn_back.setStyleSheet("""
+            QPushButton {
+                padding: 4px 10px; border: 1px solid #555555; border-radius: 4px;
+                background-color: transparent; color: #b0b0b0;
+            }
+            QPushButton:hover { background-color: #404040; color: white; }
+        """)
+        self.btn_back.clicked.connect(self.closed.emit)
+        self.title_label = QLabel()
+        self.title_label.setStyleSheet("font-weight: bold;")
+        self.position_label = QLabel()
+        self.position_label.setStyleSheet("color: #b0b0b0;")
+        header.addWidget(self.btn_back)
+        header.addWidget(self.title_label)
+        header.addStretch()
+        header.addWidget(self.position_label)
+        layout.addLayout(header)
+
+        self.canvas = PageCanvas(self)
+        self.canvas.clicked.connect(lambda forward: self.go_to(self.current + (1 if forward else -1)))
+        layout.addWidget(self.canvas)
+
+        self.loader = PageLoader(READER_PREFETCH, self)
+        self.loader.page_ready.connect(self._on_page_ready)
+        self._manifest_loaded.connect(self._on_manifest_loaded)
+        self.manifest_pool = QThreadPool(self)
+        self.manifest_pool.setMaxThreadCount(1)
+
+        # Re-decode for a new viewport size once resizing pauses
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(100)
+        self.resize_timer.timeout.connect(self._update_target_size)
+
+    def open_series(self, key, data):
+        """Shows the reader for an entry immediately and fills it in once the manifest is ready."""
+        self.close_series()
+        self.title = data.get("name") or os.path.basename(data.get("folder", ""))
+        self.title_label.setText(self.title)
+        self.position_label.setText("")
+        self.canvas.set_pixmap(None, "Loading...")
+        self.manifest_pool.start(ManifestTask(self, self.generation, self.manifests, key, data["folder"]))
+        self.setFocus()
+
+    def close_series(self):
+        """Drops the open series and every decoded page."""
+        self.generation += 1
+        self.pages = []
+        self.current = 0
+        self.loader.clear()
+        self.canvas.set_pixmap(None)
+
+    def shutdown(self):
+        self.close_series()
+        self.manifest_pool.waitForDone()
+        self.loader.shutdown()
+
+    def _on_manifest_loaded(self, generation, manifest):
+        if generation != self.generation:
+            return # Closed or replaced while the manifest was loading
+        if not manifest or not manifest.get("page_count"):
+            self.error.emit(f"No pages found for '{self.title}'.")
+            return
+        self.pages = [
+            (chapter["name"], ManifestStore.page_path(manifest, chapter, page))
+            for chapter in manifest["chapters"] for page in chapter["pages"]
+        ]
+        self._update_target_size()
+        self.loader.set_pages([path for _, path in self.pages])
+        self.go_to(0)
+
+    def go_to(self, index):
+        if not self.pages:
+            return
+        index = max(0, min(index, len(self.pages) - 1))
+        self.current = index
+        self.loader.set_current(index)
+        self._show_current()
+        chapter = self.pages[index][0]
+        self.position_label.setText(f"{chapter}  ·  Page {index + 1} / {len(self.pages)}")
+
+    def _show_current(self):
+        pixmap = self.loader.pixmap(self.current)
+        if pixmap is None and self.loader.failed(self.current):
+            self.canvas.set_pixmap(None, "Could not load this page.")
+        else:
+            self.canvas.set_pixmap(pixmap, "Loading...")
+
+    def _on_page_ready(self, index):
+        if index == self.current:
+            self._show_current()
+
+    def _update_target_size(self):
+        size = self.canvas.size() if not self.canvas.size().isEmpty() else self.size()
+        ratio = self.devicePixelRatioF()
+        self.loader.set_target_size(QSize(int(size.width() * ratio), int(size.height() * ratio)), ratio)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.resize_timer.start()
+
+    def keyPressEvent(self, event):
+        key = event.key()
+        if key in (Qt.Key_Right, Qt.Key_Space, Qt.Key_PageDown, Qt.Key_Down):
+            self.go_to(self.current + 1)
+        elif key in (Qt.Key_Left, Qt.Key_Backspace, Qt.Key_PageUp, Qt.Key_Up):
+            self.go_to(self.current - 1)
+        elif key == Qt.Key_Home:
+            self.go_to(0)
+        elif key == Qt.Key_End:
+            self.go_to(len(self.pages) - 1)
+        elif key == Qt.Key_Escape:
+            self.closed.emit()
+        else:
+            super().keyPressEvent(event)
+
+
 class MangaReader(QWidget):
+    _library_loaded = Signal(list) # Background initial load finished (issues found)
+    _metadata_write_failed = Signal(str, str) # file name, error (from the metadata writer thread)
+
     def __init__(self):
         super().__init__()
+        self.startup = StartupTimeline()
+        self.startup.mark("modules imported")
         # Change Window Title (Top Bar)
         self.setWindowTitle("MangaQ")
         self.resize(900, 600)
         self._initial_load_done = False
+        self.stall_watchdog = None
+        if STALL_LOG_PATH:
+            self.stall_watchdog = StallWatchdog(STALL_LOG_PATH, parent=self)
+            self.stall_watchdog.start()
+        self.library = open_library()
+        self._entries_populated = False # Set once load_folders() has filled the Entries model
+        self._metadata_table_populated = False
+        self.search_index = None # SearchIndex over titles/descriptions, built in idle slices after the first load
+        self._search_index_pending = [] # keys still to be indexed
 
         self._icons_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons") # Path to your icons folder
         os.makedirs(self._icons_path, exist_ok=True) # Ensure icons folder exists
@@ -406,6 +4132,24 @@ class MangaReader(QWidget):
         self.btn_info.clicked.connect(self.show_info_tab)
         self.btn_select_folder.clicked.connect(self.open_folder)
 
+        # Select Archive button - adds a single .cbz/.zip file as an entry
+        self.btn_select_archive = QPushButton("Select Archive")
+        self.btn_select_archive.setToolTip("Add a CBZ/ZIP archive as an entry")
+        self.btn_select_archive.setStyleSheet(self.btn_select_folder.styleSheet())
+        self.btn_select_archive.clicked.connect(self.open_archive)
+
+        # Scan Library button - adds every series folder under a root directory at once
+        self.btn_scan_library = QPushButton("Scan Library")
+        self.btn_scan_library.setToolTip("Add every series folder found under a library root")
+        self.btn_scan_library.setStyleSheet(self.btn_select_folder.styleSheet())
+        self.btn_scan_library.clicked.connect(self.scan_library_root)
+
+        # Check Library button - finds entries whose folder or cover went missing
+        self.btn_check_library = QPushButton("Check Library")
+        self.btn_check_library.setToolTip("Check that every entry's folder and cover still exist")
+        self.btn_check_library.setStyleSheet(self.btn_select_folder.styleSheet())
+        self.btn_check_library.clicked.connect(self.check_library_health)
+
         self.main_nav_group = QButtonGroup(self)
         self.main_nav_group.setExclusive(True)
 
@@ -433,6 +4177,29 @@ class MangaReader(QWidget):
         menu_bar.addWidget(self.btn_metadata)
         menu_bar.addWidget(self.btn_info)
         menu_bar.addStretch()
+
+        # --- Search box (Entries and Metadata tabs) ---
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search titles and descriptions...")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.setFixedWidth(260)
+        self.search_box.setStyleSheet("""
+            QLineEdit {
+                background-color: #1e1e1e; color: white; padding: 5px 8px;
+                border: 1px solid #555555; border-radius: 5px;
+            }
+            QLineEdit:focus { border: 1px solid #3a72d2; }
+        """)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150) # Filter once typing pauses instead of on every keystroke
+        self.search_timer.timeout.connect(self.apply_search)
+        self.search_box.textChanged.connect(lambda _: self.search_timer.start())
+        menu_bar.addWidget(self.search_box)
+
+        menu_bar.addWidget(self.btn_check_library)
+        menu_bar.addWidget(self.btn_scan_library)
+        menu_bar.addWidget(self.btn_select_archive)
         menu_bar.addWidget(self.btn_select_folder)
         main_layout.addLayout(menu_bar)
 
@@ -442,60 +4209,71 @@ class MangaReader(QWidget):
         self.stack.setStyleSheet("background-color: #1e1e1e;") # Darker grey for content area
         main_layout.addWidget(self.stack)
 
-        self.list_widget = QListWidget()
-        self.list_widget.setViewMode(QListView.IconMode)
-        self.list_widget.setResizeMode(QListWidget.Adjust)
-        self.list_widget.setSpacing(10)
-        self.list_widget.setContentsMargins(10, 10, 10, 10)
-        # Ensure list_widget inherits background from stack by setting its background to transparent
-        self.list_widget.setStyleSheet("QListWidget { border: none; background-color: transparent; }")
-        self.stack.addWidget(self.list_widget)
-
-        # Connect double-click signal for opening folder
-        self.list_widget.itemDoubleClicked.connect(self.open_manga_folder_in_browser)
+        # --- Pick up metadata files changed by other programs (JSON backend only) ---
+        self.metadata_watcher = None
+        if isinstance(self.library, LibraryIndex):
+            self.metadata_watcher = MetadataWatcher(self.library, parent=self)
+            self.metadata_watcher.entries_changed.connect(self._on_external_metadata_change)
+            self._metadata_write_failed.connect(self._on_metadata_write_failed)
+            self.library.writer.on_failure = self._report_write_failure
+
+        # --- Background cover decoding ---
+        self.cover_loader = CoverLoader(ThumbnailCache(THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_BYTES), self)
+
+        # --- Bulk import ---
+        self.library_scanner = LibraryScanner(parent=self)
+        self.library_scanner.progress.connect(self._on_scan_progress)
+        self.library_scanner.finished.connect(self._on_scan_finished)
+        self.scan_progress = None
+
+        # --- Health check ---
+        self.health_check = LibraryHealthCheck(parent=self)
+        self.health_check.progress.connect(self._on_health_progress)
+        self.health_check.finished.connect(self._on_health_finished)
+        self.health_progress = None
+
+        self.manifests = ManifestStore(MANIFEST_DIR)
+        self.pixmap_cache = CoverPixmapCache(COVER_PIXMAP_CACHE_BYTES)
+        self.library_model = LibraryListModel(self.cover_loader, self.manifests, self.pixmap_cache, self.health_check, self)
+        self.list_view = QListView()
+        self.list_view.setModel(self.library_model)
+        self.cover_delegate = CoverItemDelegate(self.list_view) # Keep a Python reference so the overrides stay alive
+        self.list_view.setItemDelegate(self.cover_delegate)
+        self.list_view.setViewMode(QListView.IconMode)
+        self.list_view.setResizeMode(QListView.Adjust)
+        self.list_view.setSpacing(10)
+        self.list_view.setContentsMargins(10, 10, 10, 10)
+        self.list_view.setSelectionMode(QListView.SingleSelection)
+        self.list_view.setUniformItemSizes(True) # Every row has the same size; Qt never asks per item
+        self.list_view.setLayoutMode(QListView.Batched) # Lay out large libraries in chunks between events
+        self.list_view.setBatchSize(1000)
+        self.list_view.setMouseTracking(True) # Hover highlight in the delegate
+        # Ensure list_view inherits background from stack by setting its background to transparent
+        self.list_view.setStyleSheet("QListView { border: none; background-color: transparent; color: white; }")
+        self.stack.addWidget(self.list_view)
+
+        # Double-clicking an entry opens it in the reader
+        self.list_view.doubleClicked.connect(self.open_reader)
         
-        # --- Enable custom context menu for list_widget ---
-        self.list_widget.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.list_widget.customContextMenuRequested.connect(self.show_context_menu)
+        # --- Enable custom context menu for list_view ---
+        self.list_view.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.list_view.customContextMenuRequested.connect(self.show_context_menu)
+        self.list_view.verticalScrollBar().valueChanged.connect(self._prioritize_visible_covers)
 
 
         # --- Empty State Label (Placeholder) ---
-        self.empty_list_label = QLabel("No manga folders added yet.\nClick 'Select Folder' to get started!")
+        self.empty_list_label = QLabel(EMPTY_LIBRARY_TEXT)
         self.empty_list_label.setAlignment(Qt.AlignCenter)
         self.empty_list_label.setStyleSheet("font-size: 16px; color: gray;") # Will inherit #1e1e1e background
         self.stack.addWidget(self.empty_list_label)
 
-        self.metadata_table = QTableWidget()
-        self.metadata_table.setColumnCount(2)
-        self.metadata_table.setHorizontalHeaderLabels(["Title", "Description"])
-        self.metadata_table.verticalHeader().setVisible(False)
-        self.metadata_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.metadata_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.metadata_table.setSelectionMode(QTableWidget.SingleSelection)
-        self.metadata_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
-        self.metadata_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
-        # Ensure metadata_table inherits background from stack
-        self.metadata_table.setStyleSheet("""
-            QTableWidget { 
-                background-color: transparent; /* Inherit from QStackedWidget */
-                color: white; /* Ensure text is visible */
-                gridline-color: #444444; /* Darker grid lines */
-                selection-background-color: #3a72d2; /* Blue selection */
-                selection-color: white;
-            }
-            QHeaderView::section {
-                background-color: #3a3a3a; /* Darker header background */
-                color: white;
-                padding: 4px;
-                border: 1px solid #555555;
-            }
-        """)
-        self.stack.addWidget(self.metadata_table)
+        self.metadata_model = MetadataTableModel(self)
+        # The Metadata, reader and Info tabs are built on first use to keep startup short
+        self.metadata_table = None
+        self.reader_view = None
+        self.info_tab_widget = None
+        self._library_loaded.connect(self._on_library_loaded)
 
-        # --- Instantiate InfoTabWidget ---
-        self.info_tab_widget = InfoTabWidget(self._icons_path)
-        self.stack.addWidget(self.info_tab_widget)
-        
         # --- Bottom bar (now wrapped in its own QWidget) ---
         self.bottom_bar_widget = QWidget(self)
         # Setting a fixed height for the container widget to ensure consistency
@@ -566,15 +4344,173 @@ class MangaReader(QWidget):
         # Initially hide grid/list buttons, they'll be shown by show_entries_tab
         self.btn_grid.hide()
         self.btn_list.hide()
-
+        self.startup.mark("window constructed")
+
+    # --- Lazily built tabs ---
+    def _ensure_metadata_table(self):
+        """Builds the Metadata tab's table view the first time it is needed."""
+        if self.metadata_table is not None:
+            return self.metadata_table
+        self.metadata_table = QTableView()
+        self.metadata_table.setModel(self.metadata_model)
+        self.metadata_table.verticalHeader().setVisible(False)
+        # Fixed row height: rows are never measured one by one
+        self.metadata_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.metadata_table.setEditTriggers(QTableView.NoEditTriggers)
+        self.metadata_table.setSelectionBehavior(QTableView.SelectRows)
+        self.metadata_table.setSelectionMode(QTableView.SingleSelection)
+        self.metadata_table.setWordWrap(False)
+        # Title width is sampled in load_metadata_table() instead of ResizeToContents over every row
+        self.metadata_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Interactive)
+        self.metadata_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.metadata_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder) # Library order until a header is clicked
+        self.metadata_table.setSortingEnabled(True)
+        # Ensure metadata_table inherits background from stack
+        self.metadata_table.setStyleSheet("""
+            QTableView { 
+                background-color: transparent; /* Inherit from QStackedWidget */
+                color: white; /* Ensure text is visible */
+                gridline-color: #444444; /* Darker grid lines */
+                selection-background-color: #3a72d2; /* Blue selection */
+                selection-color: white;
+            }
+            QHeaderView::section {
+                background-color: #3a3a3a; /* Darker header background */
+                color: white;
+                padding: 4px;
+                border: 1px solid #555555;
+            }
+        """)
+        self.stack.addWidget(self.metadata_table)
+        return self.metadata_table
+
+    def _ensure_reader_view(self):
+        """Builds the in-app page reader the first time an entry is opened."""
+        if self.reader_view is not None:
+            return self.reader_view
+        self.reader_view = ReaderView(self.manifests)
+        self.reader_view.closed.connect(self.close_reader)
+        self.reader_view.error.connect(self._on_reader_error)
+        self.stack.addWidget(self.reader_view)
+        return self.reader_view
+
+    def _ensure_info_tab(self):
+        """Builds the Info tab the first time it is shown."""
+        if self.info_tab_widget is not None:
+            return self.info_tab_widget
+        self.info_tab_widget = InfoTabWidget(self._icons_path)
+        self.stack.addWidget(self.info_tab_widget)
+        return self.info_tab_widget
 
     def showEvent(self, event):
         """Triggers the initial data load only once after the window is shown."""
         super().showEvent(event)
         if not self._initial_load_done:
+            self._initial_load_done = True
+            if FAST_START:
+                self._fast_start()
+                return
             # Call show_entries_tab to correctly set up the initial view and button visibility
             self.show_entries_tab() 
-            self._initial_load_done = True
+            if self.metadata_watcher is not None:
+                self.metadata_watcher.start()
+            self.startup.finish("entries shown")
+
+    # --- Fast start ---
+    def _fast_start(self):
+        """
+        Shows the first screen from the startup snapshot (when it still matches the library) and
+        loads the full library on a worker thread once that first frame is on screen.
+        """
+        self.btn_grid.show()
+        self.btn_list.show()
+        self.search_box.show()
+        entries = self._read_startup_snapshot()
+        if entries:
+            self.library_model.set_cover_size(self._cover_size())
+            self.library_model.set_entries(entries)
+            self.stack.setCurrentWidget(self.list_view)
+            self.update_view_layout()
+            self.startup.mark("snapshot shown")
+        else:
+            self.empty_list_label.setText(LOADING_LIBRARY_TEXT)
+            self.stack.setCurrentWidget(self.empty_list_label)
+        # Start loading once the first screen has been painted, so the two don't compete
+        self._first_paint_widget = self.stack.currentWidget()
+        if self._first_paint_widget is self.list_view:
+            self._first_paint_widget = self.list_view.viewport()
+        self._first_paint_widget.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if watched is getattr(self, "_first_paint_widget", None) and event.type() == QEvent.Paint:
+            watched.removeEventFilter(self)
+            self._first_paint_widget = None
+            QTimer.singleShot(0, self._start_background_load) # Runs after this paint has finished
+        return super().eventFilter(watched, event)
+
+    def _start_background_load(self):
+        self.startup.mark("first frame")
+        QThreadPool.globalInstance().start(LibraryLoadTask(self.library, self._library_loaded))
+
+    def _on_library_loaded(self, issues):
+        self.startup.mark("library loaded")
+        if self.metadata_watcher is not None:
+            self.metadata_watcher.start()
+        self._report_library_issues(issues)
+        self.empty_list_label.setText(EMPTY_LIBRARY_TEXT)
+        current = self.stack.currentWidget()
+        if not self._entries_populated and (current is self.list_view or current is self.empty_list_label):
+            scroll = self.list_view.verticalScrollBar().value() # The snapshot rows are a prefix of the library
+            self.show_entries_tab() # Replaces the snapshot rows with the whole library
+            self.list_view.verticalScrollBar().setValue(scroll)
+        self.startup.finish("entries shown")
+
+    def _read_startup_snapshot(self):
+        """Returns the snapshot's (key, data) pairs, or None if there is none or the library changed since."""
+        try:
+            with open(STARTUP_SNAPSHOT_PATH, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get("token") != self.library.change_token():
+            return None
+        return [(key, data) for key, data in snapshot.get("entries", [])]
+
+    def _write_startup_snapshot(self):
+        """Saves the first screenful of entries for the next fast start (atomically, like the manifests)."""
+        if not self.library.loaded:
+            return
+        snapshot = {"token": self.library.change_token(),
+                    "entries": self.library.entries()[:STARTUP_SNAPSHOT_ENTRIES]}
+        tmp_path = f"{STARTUP_SNAPSHOT_PATH}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, STARTUP_SNAPSHOT_PATH)
+        except OSError as e:
+            print(f"Warning: Could not save the startup snapshot: {e}")
+
+    def closeEvent(self, event):
+        self.library_scanner.shutdown()
+        self.health_check.cancel() # Its threads are daemons; a hung stat never delays closing
+        if self.metadata_watcher is not None:
+            self.metadata_watcher.stop()
+        if self.reader_view is not None:
+            self.reader_view.shutdown()
+        self.cover_loader.shutdown()
+        if TRACER.enabled:
+            TRACER.count("pixmap_cache", hits=self.pixmap_cache.hits, misses=self.pixmap_cache.misses,
+                         evictions=self.pixmap_cache.evictions)
+        debug_log(self.pixmap_cache.summary())
+        unsaved = self.library.close() # Waits for queued metadata writes
+        if unsaved:
+            shown = "\n".join(unsaved[:10]) + (f"\n... and {len(unsaved) - 10} more" if len(unsaved) > 10 else "")
+            QMessageBox.warning(self, "Unsaved Changes",
+                                f"{len(unsaved)} metadata file(s) could not be saved to '{METADATA_DIR}':\n\n{shown}")
+        self._write_startup_snapshot()
+        if self.stall_watchdog is not None:
+            self.stall_watchdog.stop()
+        super().closeEvent(event)
 
     def resizeEvent(self, event):
         """Uses a timer to avoid rapid layout recalculations while resizing."""
@@ -601,20 +4537,26 @@ class MangaReader(QWidget):
             self.notification_popup.move(x, y)
 
 
+    @TRACER.traced("ui.grid_layout")
     def update_grid_columns(self):
         """Calculates grid dimensions based on widget width, ensuring full fill, accounting for spacing."""
-        if self.stack.currentWidget() != self.list_widget:
+        if self.stack.currentWidget() != self.list_view:
             return
 
-        if self.list_widget.viewMode() != QListView.IconMode:
+        if self.list_view.viewMode() != QListView.IconMode:
             return
 
-        cols = 5
-        spacing = self.list_widget.spacing()
-        margins = self.list_widget.contentsMargins()
+        spacing = self.list_view.spacing()
+        margins = self.list_view.contentsMargins()
 
-        viewport_width = self.list_widget.viewport().width()
+        viewport_width = self.list_view.viewport().width()
         effective_drawable_width = viewport_width - margins.left() - margins.right()
+
+        # Fit as many columns as the width allows, unless a fixed count is configured
+        if GRID_COLUMNS > 0:
+            cols = GRID_COLUMNS
+        else:
+            cols = max(1, (effective_drawable_width + spacing) // (GRID_MIN_ITEM_WIDTH + spacing))
         total_spacing_width = (cols - 1) * spacing
 
         if cols > 0:
@@ -631,18 +4573,25 @@ class MangaReader(QWidget):
         text_height_allowance = 30 # For title
         item_height = icon_display_height + text_height_allowance
 
-        self.list_widget.setIconSize(QSize(item_width, icon_display_height))
-        self.list_widget.setGridSize(QSize(item_width, item_height))
-        
-        for i in range(self.list_widget.count()):
-            self.list_widget.item(i).setSizeHint(QSize(item_width, item_height))
+        self._apply_item_geometry(QSize(item_width, icon_display_height), QSize(item_width, item_height))
 
-        self.list_widget.updateGeometries()
-        self.list_widget.viewport().update()
+    def _apply_item_geometry(self, icon_size, grid_size):
+        """
+        Applies the uniform item geometry shared by every entry. Nothing here is per-item: the
+        delegate sizes rows from gridSize(), so a resize costs the same for any library size,
+        and the view is only re-laid out when the geometry actually changed.
+        """
+        if self.list_view.iconSize() == icon_size and self.list_view.gridSize() == grid_size:
+            return
+        self.list_view.setIconSize(icon_size)
+        self.list_view.setGridSize(grid_size)
+        self.library_model.set_cover_size(self._cover_size()) # No-op unless the cover tier changed
+        self.list_view.updateGeometries()
+        self.list_view.viewport().update()
 
     def update_view_layout(self):
         """Called after resizing to apply the correct layout."""
-        if self.stack.currentWidget() is not self.list_widget:
+        if self.stack.currentWidget() is not self.list_view:
             return
         
         # Only update grid columns if the grid view is active
@@ -650,41 +4599,43 @@ class MangaReader(QWidget):
             self.update_grid_columns()
         else: # Otherwise, ensure list view settings are applied
             self.set_list_view()
+        self._prioritize_visible_covers() # A new layout can bring other rows on screen
 
     def set_grid_view(self):
-        self.list_widget.setViewMode(QListView.IconMode)
-        self.list_widget.setFlow(QListView.LeftToRight)
-        self.list_widget.setWrapping(True)
+        if self.list_view.viewMode() != QListView.IconMode:
+            self.list_view.setViewMode(QListView.IconMode)
+            self.list_view.setFlow(QListView.LeftToRight)
+            self.list_view.setWrapping(True)
         self.update_grid_columns()
 
+    @TRACER.traced("ui.list_layout")
     def set_list_view(self):
-        self.list_widget.setViewMode(QListView.ListMode)
-        self.list_widget.setFlow(QListView.TopToBottom)
-        self.list_widget.setWrapping(False)
+        if self.list_view.viewMode() != QListView.ListMode:
+            self.list_view.setViewMode(QListView.ListMode)
+            self.list_view.setFlow(QListView.TopToBottom)
+            self.list_view.setWrapping(False)
         
-        self.list_widget.setIconSize(QSize(60, 80))
-        
-        viewport_width = self.list_widget.viewport().width()
-        margins = self.list_widget.contentsMargins()
+        viewport_width = self.list_view.viewport().width()
+        margins = self.list_view.contentsMargins()
         list_item_width = viewport_width - margins.left() - margins.right()
         list_item_height = 90
         
-        self.list_widget.setGridSize(QSize(list_item_width, list_item_height))
-        
-        for i in range(self.list_widget.count()):
-            self.list_widget.item(i).setSizeHint(QSize(list_item_width, list_item_height))
-        self.list_widget.updateGeometries()
-        self.list_widget.viewport().update()
+        self._apply_item_geometry(QSize(60, 80), QSize(list_item_width, list_item_height))
 
     # Renamed from show_folders_tab to show_entries_tab
     def show_entries_tab(self):
+        if self.reader_view is not None:
+            self.reader_view.close_series()
         # Show grid/list buttons when on Entries tab
         self.btn_grid.show()
         self.btn_list.show()
+        self.search_box.show()
         
-        self.load_folders() 
-        if self.list_widget.count() > 0:
-            self.stack.setCurrentWidget(self.list_widget)
+        # The model is kept in sync incrementally, so it is only filled the first time
+        if not self._entries_populated:
+            self.load_folders()
+        if self.library_model.rowCount() > 0:
+            self.stack.setCurrentWidget(self.list_view)
         else:
             self.stack.setCurrentWidget(self.empty_list_label)
         
@@ -693,83 +4644,88 @@ class MangaReader(QWidget):
         self.update_view_layout()
 
     def show_metadata_tab(self):
+        if self.reader_view is not None:
+            self.reader_view.close_series()
         # Hide grid/list buttons when not on Entries tab
         self.btn_grid.hide()
         self.btn_list.hide()
-        self.stack.setCurrentWidget(self.metadata_table)
-        self.load_metadata_table()
+        self.search_box.show()
+        self.stack.setCurrentWidget(self._ensure_metadata_table())
+        if not self._metadata_table_populated:
+            self.load_metadata_table()
 
     def show_info_tab(self):
+        if self.reader_view is not None:
+            self.reader_view.close_series()
         # Hide grid/list buttons when not on Entries tab
         self.btn_grid.hide()
         self.btn_list.hide()
-        self.stack.setCurrentWidget(self.info_tab_widget)
+        self.search_box.hide()
+        self.stack.setCurrentWidget(self._ensure_info_tab())
 
     # --- Folder and data handling functions ---
+    def _report_library_issues(self, issues):
+        for kind, file_name, detail in issues:
+            if kind == "duplicate":
+                self.notification_popup.show_message(
+                    f"Duplicate entry for '{os.path.basename(detail)}' detected in metadata!",
+                    is_error=True, duration_ms=5000, summary="{count} duplicate entries detected in metadata!"
+                )
+            elif kind == "corrupted":
+                self.notification_popup.show_message(f"Corrupted metadata file: {file_name}", is_error=True, duration_ms=5000,
+                                                     summary="{count} corrupted metadata files")
+
+    @TRACER.traced("ui.load_folders")
     def load_folders(self):
-        self.list_widget.clear()
-        metadata_dir = "metadata" 
-        found_items = False
-        loaded_folder_paths = set() 
-
-        if os.path.exists(metadata_dir):
-            for file_name in sorted(os.listdir(metadata_dir)):
-                if not file_name.endswith(".json"): continue
-                file_path = os.path.join(metadata_dir, file_name)
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    
-                    folder_path_in_json = data.get("folder")
-                    if not folder_path_in_json:
-                        print(f"Warning: JSON file {file_name} is missing 'folder' key. Skipping.")
-                        continue
-                    
-                    normalized_folder_path = os.path.normpath(folder_path_in_json)
-
-                    if normalized_folder_path in loaded_folder_paths:
-                        print(f"DEBUG: WARNING! Duplicate entry detected for folder: '{normalized_folder_path}'. "
-                              f"Skipping JSON file: {file_name}. "
-                              f"This usually means multiple metadata files point to the same folder.")
-                        self.notification_popup.show_message(
-                            f"Duplicate entry for '{os.path.basename(normalized_folder_path)}' detected in metadata!",
-                            is_error=True, duration_ms=5000
-                        )
-                        continue
-
-                    loaded_folder_paths.add(normalized_folder_path)
-
-                    cover_path = data.get("cover")
-                    name = data.get("name") or os.path.basename(folder_path_in_json)
-                    
-                    pixmap = QPixmap()
-                    if not (cover_path and os.path.exists(cover_path) and pixmap.load(cover_path)):
-                        pixmap = QPixmap(120, 160)
-                        pixmap.fill(QColor("#1a1a1a")) # Use a dark color for "No Cover" background matching container
-                        painter = QPainter(pixmap)
-                        painter.setPen(QColor("lightgray")) # Light text on dark background
-                        painter.setFont(self.font())
-                        painter.drawText(pixmap.rect(), Qt.AlignCenter, "No Cover\nAvailable")
-                        painter.end()
-                        
-                    
-                    item = QListWidgetItem(QIcon(pixmap), name)
-                    item.setData(Qt.UserRole, data)
-                    self.list_widget.addItem(item)
-                    found_items = True
-                except json.JSONDecodeError:
-                    print(f"Error: Corrupted JSON file detected: {file_path}")
-                    self.notification_popup.show_message(f"Corrupted metadata file: {file_name}", is_error=True, duration_ms=5000)
-                except Exception as e:
-                    print(f"An unexpected error occurred while loading {file_path}: {e}")
-        
-        if not found_items:
+        self._report_library_issues(self.library.load())
+        self.library_model.set_cover_size(self._cover_size())
+        self.library_model.set_entries(self.library.entries())
+        self.library_model.set_filter(self._search_keys())
+        self._entries_populated = True
+        self._start_search_index_build()
+
+        if self.library_model.rowCount() == 0:
             self.stack.setCurrentWidget(self.empty_list_label)
         else:
-            self.stack.setCurrentWidget(self.list_widget)
+            self.stack.setCurrentWidget(self.list_view)
 
         self.update_view_layout()
 
+    def _cover_size(self):
+        """Cover tier matching the active view's icon size."""
+        return cover_tier(self.list_view.iconSize(), self.list_view.devicePixelRatioF())
+
+    def _visible_rows(self):
+        """Returns the range of rows currently inside the list viewport."""
+        count = self.library_model.rowCount()
+        if count == 0:
+            return range(0)
+        viewport_rect = self.list_view.viewport().rect()
+        # Find any row on screen (corners can fall into the spacing between items), then walk outwards
+        anchor = -1
+        for y in range(viewport_rect.top() + 1, viewport_rect.bottom(), 5):
+            for x in (viewport_rect.width() // 3, viewport_rect.width() // 2, viewport_rect.width() * 2 // 3):
+                anchor = self.list_view.indexAt(QPoint(x, y)).row()
+                if anchor >= 0:
+                    break
+            if anchor >= 0:
+                break
+        if anchor < 0:
+            return range(0)
+        first = anchor
+        while first > 0 and self.list_view.visualRect(self.library_model.index(first - 1)).bottom() >= viewport_rect.top():
+            first -= 1
+        last = anchor
+        while last < count - 1 and self.list_view.visualRect(self.library_model.index(last + 1)).top() <= viewport_rect.bottom():
+            last += 1
+        return range(first, last + 1)
+
+    def _prioritize_visible_covers(self, *_):
+        """Moves covers of rows scrolled into view ahead of rows that were scrolled past."""
+        keys = [self.library_model.key_at(row) for row in self._visible_rows()]
+        self.cover_loader.prioritize(keys)
+        self.pixmap_cache.set_visible(keys)
+
 
     def open_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Select Manga Folder")
@@ -781,7 +4737,27 @@ class MangaReader(QWidget):
             self.notification_popup.show_message(f"Folder '{os.path.basename(folder)}' already exists in your library!", is_error=True, duration_ms=3000)
             return
 
-        dialog = FolderDialog(folder, parent=self) 
+        self._add_entry(folder)
+
+    def open_archive(self):
+        archive, _ = QFileDialog.getOpenFileName(self, "Select Manga Archive", "", "Comic Archives (*.cbz *.zip)")
+        if not archive:
+            self.notification_popup.show_message("Archive selection cancelled.", is_error=True, duration_ms=3000)
+            return
+
+        if self.metadata_exists(archive):
+            self.notification_popup.show_message(f"Archive '{os.path.basename(archive)}' already exists in your library!", is_error=True, duration_ms=3000)
+            return
+
+        if not zipfile.is_zipfile(archive):
+            self.notification_popup.show_message(f"'{os.path.basename(archive)}' is not a valid CBZ/ZIP archive.", is_error=True, duration_ms=3000)
+            return
+
+        self._add_entry(archive)
+
+    def _add_entry(self, folder):
+        """Asks for the details of a new entry (a folder or an archive) and saves it."""
+        dialog = FolderDialog(folder, cover_loader=self.cover_loader, parent=self) 
         if dialog.exec() == QDialog.Accepted:
             try:
                 manga_data = dialog.get_data()
@@ -789,10 +4765,9 @@ class MangaReader(QWidget):
                     manga_data["uuid"] = str(uuid.uuid4())
                 self.save_metadata(manga_data)
                 self.notification_popup.show_message(f"'{manga_data['name']}' added to library!", is_error=False, duration_ms=3000)
-                self.load_folders()
                 # Changed btn_folders to btn_entries
-                if not self.btn_entries.isChecked():
-                    self.btn_entries.setChecked(True)
+                self.btn_entries.setChecked(True)
+                self.show_entries_tab()
             except Exception as e:
                 self.notification_popup.show_message(f"Failed to add manga: {e}", is_error=True, duration_ms=3000)
                 print(f"Failed to add manga: {e}")
@@ -800,15 +4775,147 @@ class MangaReader(QWidget):
             self.notification_popup.show_message("Adding manga cancelled.", is_error=True, duration_ms=3000)
 
 
-    def open_manga_folder_in_browser(self, item):
-        """Opens the manga's folder in the system file browser when item is double-clicked."""
-        manga_data = item.data(Qt.UserRole)
+    def scan_library_root(self):
+        """Scans a library root for series folders and adds every new one in a single batch."""
+        if self.library_scanner.running:
+            return
+        root = QFileDialog.getExistingDirectory(self, "Select Library Root")
+        if not root:
+            self.notification_popup.show_message("Library scan cancelled.", is_error=True, duration_ms=3000)
+            return
+        self.library.load()
+        self._scan_root = root
+        self.scan_progress = QProgressDialog(f"Scanning '{os.path.basename(root) or root}'...", "Cancel", 0, 0, self)
+        self.scan_progress.setWindowTitle("Scan Library")
+        self.scan_progress.setWindowModality(Qt.WindowModal)
+        self.scan_progress.setMinimumDuration(0)
+        self.scan_progress.setMinimumWidth(380)
+        self.scan_progress.canceled.connect(self.library_scanner.cancel)
+        self.scan_progress.show()
+        self.btn_scan_library.setEnabled(False)
+        self.library_scanner.start(root)
+
+    def _on_scan_progress(self, scanned, found, rate):
+        if self.scan_progress is not None:
+            self.scan_progress.setLabelText(f"Scanned {scanned} folders, found {found} series ({rate:.0f} folders/s)")
+
+    @TRACER.traced("ui.import_scan")
+    def _on_scan_finished(self, found, cancelled):
+        if self.scan_progress is not None:
+            self.scan_progress.canceled.disconnect(self.library_scanner.cancel)
+            self.scan_progress.close()
+            self.scan_progress.deleteLater()
+            self.scan_progress = None
+        self.btn_scan_library.setEnabled(True)
+        if cancelled:
+            self.notification_popup.show_message("Library scan cancelled.", is_error=True, duration_ms=3000)
+            return
+
+        new_entries = [data for data in found if not self.metadata_exists(data["folder"])]
+        skipped = len(found) - len(new_entries)
+        if not new_entries:
+            self.notification_popup.show_message(
+                f"No new series found in '{os.path.basename(self._scan_root)}' ({skipped} already in library).",
+                is_error=True, duration_ms=5000
+            )
+            return
+        for data in new_entries:
+            data["uuid"] = str(uuid.uuid4())
+        try:
+            keys = self.library.save_many(new_entries)
+        except Exception as e:
+            self.notification_popup.show_message(f"Failed to import library: {e}", is_error=True, duration_ms=5000)
+            print(f"Failed to import library: {e}")
+            return
+        self._entries_saved(keys)
+        self.notification_popup.show_message(
+            f"Added {len(keys)} series from '{os.path.basename(self._scan_root)}' ({skipped} already in library).",
+            is_error=False, duration_ms=5000
+        )
+        self.btn_entries.setChecked(True)
+        self.show_entries_tab()
+
+    def check_library_health(self):
+        """Stats every entry's folder and cover in the background and badges the ones with problems."""
+        if self.health_check.running:
+            return
+        self.library.load()
+        self.health_progress = QProgressDialog("Checking library...", "Cancel", 0, 0, self)
+        self.health_progress.setWindowTitle("Check Library")
+        self.health_progress.setWindowModality(Qt.WindowModal)
+        self.health_progress.setMinimumDuration(500) # Local libraries are usually done before it shows
+        self.health_progress.setMinimumWidth(380)
+        self.health_progress.canceled.connect(self.health_check.cancel)
+        self.btn_check_library.setEnabled(False)
+        self.health_check.start(self.library.entries())
+
+    def _on_health_progress(self, checked, total):
+        if self.health_progress is not None:
+            self.health_progress.setMaximum(total)
+            self.health_progress.setValue(checked)
+            self.health_progress.setLabelText(f"Checked {checked} of {total} folders and covers")
+
+    @TRACER.traced("ui.health_results")
+    def _on_health_finished(self, checked, cancelled):
+        if self.health_progress is not None:
+            self.health_progress.canceled.disconnect(self.health_check.cancel)
+            self.health_progress.close()
+            self.health_progress.deleteLater()
+            self.health_progress = None
+        self.btn_check_library.setEnabled(True)
+        if cancelled:
+            self.notification_popup.show_message("Library check cancelled.", is_error=True, duration_ms=3000)
+            return
+        self.list_view.viewport().update() # Repaint the badges
+        counts = {}
+        for result in self.health_check.results.values():
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+        if not counts:
+            self.notification_popup.show_message(f"All {checked} entries are OK.", is_error=False, duration_ms=3000)
+            return
+        labels = {"missing_folder": "missing folder{}", "unreachable": "unreachable folder{}",
+                  "not_checked": "entr{} not checked", "missing_cover": "missing cover{}"}
+        plurals = {"not_checked": ("y", "ies")}
+        problems = ", ".join(f"{count} {labels[status].format(plurals.get(status, ('', 's'))[count != 1])}"
+                             for status, count in counts.items())
+        self.notification_popup.show_message(f"Library check: {problems}.", is_error=True, duration_ms=5000)
+
+    def open_reader(self, index):
+        """Opens the double-clicked entry in the in-app reader."""
+        manga_data = index.data(Qt.UserRole)
+        key = index.data(LibraryListModel.KeyRole)
+        if not manga_data or not manga_data.get("folder") or key is None:
+            self.notification_popup.show_message("Could not retrieve folder path for this item.", is_error=True, duration_ms=3000)
+            return
+        if not os.path.exists(manga_data["folder"]):
+            self.notification_popup.show_message(f"Folder '{manga_data['folder']}' not found! Metadata may be outdated.", is_error=True, duration_ms=5000)
+            print(f"Error: Folder path does not exist: {manga_data['folder']}")
+            return
+        self.btn_grid.hide()
+        self.btn_list.hide()
+        self.search_box.hide()
+        self.stack.setCurrentWidget(self._ensure_reader_view())
+        self.reader_view.open_series(key, manga_data)
+
+    def close_reader(self):
+        self.btn_entries.setChecked(True)
+        self.show_entries_tab()
+
+    def _on_reader_error(self, message):
+        self.notification_popup.show_message(message, is_error=True, duration_ms=3000)
+        self.close_reader()
+
+    def open_manga_folder_in_browser(self, index):
+        """Opens the manga's folder in the system file browser when an entry is double-clicked."""
+        manga_data = index.data(Qt.UserRole)
         if manga_data and "folder" in manga_data:
             folder_path = manga_data["folder"]
+            if os.path.isfile(folder_path):
+                folder_path = os.path.dirname(folder_path) # Archive entries open the folder containing them
             if os.path.isdir(folder_path):
                 try:
                     QDesktopServices.openUrl(QUrl.fromLocalFile(folder_path))
-                    self.notification_popup.show_message(f"Opened folder for '{item.text()}'", is_error=False, duration_ms=3000)
+                    self.notification_popup.show_message(f"Opened folder for '{index.data(Qt.DisplayRole)}'", is_error=False, duration_ms=3000)
                 except Exception as e:
                     self.notification_popup.show_message(f"Could not open folder: {e}", is_error=True, duration_ms=3000)
                     print(f"Error opening folder '{folder_path}': {e}")
@@ -820,160 +4927,215 @@ class MangaReader(QWidget):
             print("Error: No folder data associated with this item.")
 
 
+    @TRACER.traced("ui.load_metadata_table")
     def load_metadata_table(self):
-        self.metadata_table.setRowCount(0)
-        metadata_dir = "metadata" 
-        if not os.path.exists(metadata_dir): return
-
-        all_metadata = []
-        for file_name in sorted(os.listdir(metadata_dir)):
-            if not file_name.endswith(".json"): continue
-            file_path = os.path.join(metadata_dir, file_name)
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    all_metadata.append(data)
-            except json.JSONDecodeError:
-                print(f"Error: Corrupted JSON file detected in metadata table load: {file_path}")
-            except Exception as e:
-                print(f"An unexpected error occurred while loading metadata for table {file_path}: {e}")
-
-        self.metadata_table.setRowCount(len(all_metadata))
-        for row, data in enumerate(all_metadata):
-            title = data.get("name", "Unknown")
-            description = data.get("description", "")
-            self.metadata_table.setItem(row, 0, QTableWidgetItem(title))
-            self.metadata_table.setItem(row, 1, QTableWidgetItem(description))
-
-    def _get_metadata_filename(self, manga_data):
-        """
-        Determines the filename for a manga's metadata JSON file.
-        Prioritizes existing UUID, otherwise uses the folder's UUID.
-        """
-        metadata_dir = "metadata" 
-
-        if "uuid" in manga_data and manga_data["uuid"]:
-            return f"{manga_data['uuid']}.json"
+        self._report_library_issues(self.library.load())
+        self.metadata_model.set_entries(self.library.entries())
+        self.metadata_model.set_filter(self._search_keys())
+        table = self._ensure_metadata_table()
+        header = table.horizontalHeader()
+        if header.sortIndicatorSection() >= 0:
+            self.metadata_model.sort(header.sortIndicatorSection(), header.sortIndicatorOrder())
+        table.setColumnWidth(0, self.metadata_model.sample_column_width(0, table.fontMetrics()))
+        self._metadata_table_populated = True
+
+    # --- Search ---
+    SEARCH_INDEX_SLICE = 1000 # Entries indexed per event-loop turn
+
+    def _start_search_index_build(self):
+        """Indexes the library a slice at a time while the event loop is idle, so typing never waits on it."""
+        if self.search_index is not None:
+            return
+        self.search_index = SearchIndex()
+        self._search_index_pending = [key for key, _ in self.library.entries()]
+        QTimer.singleShot(0, self._index_next_slice)
+
+    @TRACER.traced("search.index_slice")
+    def _index_next_slice(self, limit=SEARCH_INDEX_SLICE):
+        pending = self._search_index_pending
+        for _ in range(min(limit, len(pending))):
+            key = pending.pop()
+            data = self.library.get(key) # Current data; entries deleted meanwhile are skipped
+            if data is not None:
+                self.search_index.add(key, data)
+        if pending:
+            QTimer.singleShot(0, self._index_next_slice)
+        else:
+            self.search_index.sort_names() # Here rather than in the first search
+
+    def _search_keys(self):
+        """Returns the SearchResults for the search box, or None when it is empty (or too short to filter)."""
+        query = self.search_box.text().strip()
+        if len(query) < SearchIndex.MIN_QUERY_LENGTH:
+            return None
+        if self.search_index is None:
+            self.library.load()
+            self._start_search_index_build()
+        if self._search_index_pending:
+            self._index_next_slice(len(self._search_index_pending)) # Searched before the idle build finished
+        return self.search_index.search(query)
+
+    @TRACER.traced("ui.search")
+    def apply_search(self):
+        """Filters the Entries view and the metadata table to the current search."""
+        keys = self._search_keys()
+        self.empty_list_label.setText(EMPTY_LIBRARY_TEXT if keys is None else NO_SEARCH_RESULTS_TEXT)
+        if self._entries_populated:
+            self.library_model.set_filter(keys)
+            self._update_entries_placeholder()
+        if self._metadata_table_populated:
+            self.metadata_model.set_filter(keys)
+
+    # --- Incremental view updates (O(1) UI work per mutation) ---
+    def _entry_saved(self, key):
+        """Reflects one added or edited entry in the Entries view and the metadata table."""
+        data = self.library.get(key)
+        if data is None:
+            return
+        if self.search_index is not None:
+            self.search_index.add(key, data)
+        if self._entries_populated:
+            self.library_model.upsert_entry(key, data)
+        if self._metadata_table_populated:
+            self.metadata_model.upsert_entry(key, data)
+        self._update_entries_placeholder()
+        if self.search_box.text().strip():
+            self.search_timer.start() # The entry may now (no longer) match, or rank differently
+
+    @TRACER.traced("ui.entries_saved")
+    def _entries_saved(self, keys):
+        """Reflects a batch of added entries; large batches rebuild the views once instead of row by row."""
+        if len(keys) <= BULK_UPDATE_THRESHOLD:
+            for key in keys:
+                self._entry_saved(key)
+            return
+        if self.search_index is not None:
+            for key in keys:
+                data = self.library.get(key)
+                if data is not None:
+                    self.search_index.add(key, data)
+        if self._entries_populated:
+            self.library_model.set_entries(self.library.entries())
+            self.library_model.set_filter(self._search_keys())
+        if self._metadata_table_populated:
+            self.load_metadata_table()
+        self._update_entries_placeholder()
+
+    def _entry_removed(self, key):
+        """Drops one deleted entry from the Entries view and the metadata table."""
+        self.manifests.delete(key)
+        if self.search_index is not None:
+            self.search_index.remove(key)
+        self.library_model.remove_entry(key)
+        if self._metadata_table_populated:
+            self.metadata_model.remove_entry(key)
+        self._update_entries_placeholder()
+
+    @TRACER.traced("ui.external_change")
+    def _on_external_metadata_change(self, changed, removed, issues):
+        self._report_library_issues(issues)
+        for key in removed:
+            self._entry_removed(key)
+        for key in changed:
+            self._entry_saved(key)
+
+    def _report_write_failure(self, file_name, error):
+        """MetadataWriter.on_failure; runs on the writer thread, so the GUI is reached through a signal."""
+        try:
+            self._metadata_write_failed.emit(file_name, error)
+        except RuntimeError:
+            pass # The window is already gone; close() reports the file instead
+
+    def _on_metadata_write_failed(self, file_name, error):
+        self.notification_popup.show_message(
+            f"Could not save metadata file {file_name}: {error}", is_error=True, duration_ms=8000,
+            summary="{count} metadata files could not be saved!"
+        )
+        self.metadata_watcher.refresh_files([file_name]) # Show what is actually on disk again
 
-        normalized_folder_path = os.path.normpath(manga_data["folder"])
-        
-        if os.path.exists(metadata_dir):
-            for file_name in os.listdir(metadata_dir):
-                if file_name.endswith(".json"):
-                    file_path = os.path.join(metadata_dir, file_name)
-                    try:
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            existing_data = json.load(f)
-                            if os.path.normpath(existing_data.get("folder", "")) == normalized_folder_path:
-                                if "uuid" in existing_data and existing_data["uuid"]:
-                                    print(f"DEBUG: Found existing UUID for '{normalized_folder_path}': {existing_data['uuid']}")
-                                    manga_data["uuid"] = existing_data["uuid"]
-                                    return f"{existing_data['uuid']}.json"
-                    except json.JSONDecodeError:
-                        print(f"Warning: Corrupted JSON file detected during UUID lookup: {file_path}")
-                    except Exception as e:
-                        print(f"An unexpected error occurred during UUID lookup for {file_path}: {e}")
-
-        new_uuid = str(uuid.uuid4())
-        manga_data["uuid"] = new_uuid
-        print(f"DEBUG: Generating new UUID for '{normalized_folder_path}': {new_uuid}")
-        return f"{new_uuid}.json"
+    def _update_entries_placeholder(self):
+        """Swaps between the list and the empty-state label when the library becomes (non-)empty."""
+        current = self.stack.currentWidget()
+        if current is not self.list_view and current is not self.empty_list_label:
+            return
+        if self.library_model.rowCount() > 0:
+            if current is not self.list_view:
+                self.stack.setCurrentWidget(self.list_view)
+                self.update_view_layout()
+        else:
+            self.stack.setCurrentWidget(self.empty_list_label)
 
+    @TRACER.traced("ui.save_metadata")
     def save_metadata(self, data):
-        metadata_dir = "metadata" 
-        os.makedirs(metadata_dir, exist_ok=True)
-        
-        file_name = self._get_metadata_filename(data) 
-        path = os.path.join(metadata_dir, file_name)
-        
-        print(f"DEBUG: Saving metadata.")
-        print(f"DEBUG: Data 'folder' key: {data['folder']}")
-        print(f"DEBUG: Data 'uuid' key: {data.get('uuid')}")
-        print(f"DEBUG: Determined filename for save: {file_name}")
-        print(f"DEBUG: Full save path: {path}")
+        self.library.load()
+        debug_log("Saving metadata.")
+        debug_log(f"Data 'folder' key: {data['folder']}")
+        debug_log(f"Data 'uuid' key: {data.get('uuid')}")
 
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            print(f"DEBUG: Successfully saved/overwritten {path}")
+            key = self.library.save(data)
+            debug_log(f"Successfully saved/overwritten entry {key}")
         except Exception as e:
-            print(f"DEBUG: ERROR saving metadata: {e}")
+            debug_log(f"ERROR saving metadata: {e}")
             raise Exception(f"Failed to write metadata file for {data['folder']}: {e}")
+        self._entry_saved(key)
+        return key
 
     def metadata_exists(self, folder_path):
-        metadata_dir = "metadata" 
-        if not os.path.exists(metadata_dir):
-            return False
-        
-        normalized_target_folder = os.path.normpath(folder_path)
+        self.library.load()
+        return self.library.contains_folder(folder_path)
 
-        for file_name in os.listdir(metadata_dir):
-            if not file_name.endswith(".json"): continue
-            file_path = os.path.join(metadata_dir, file_name)
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    if os.path.normpath(data.get("folder", "")) == normalized_target_folder:
-                        return True
-            except json.JSONDecodeError:
-                print(f"Warning: Corrupted JSON file found during existence check: {file_path}. Skipping.")
-            except Exception as e:
-                print(f"Warning: Error reading metadata during existence check for {file_path}: {e}")
-        return False
+    @TRACER.traced("ui.delete_entry")
+    def delete_entry(self, key):
+        """Deletes one entry without asking for confirmation. Returns False if it was already gone."""
+        self.library.load()
+        deleted = key is not None and self.library.delete(key)
+        self._entry_removed(key)
+        return deleted
 
     # --- New: Context Menu Methods ---
     def show_context_menu(self, position):
-        item = self.list_widget.itemAt(position)
-        if item:
+        index = self.list_view.indexAt(position)
+        if index.isValid():
             context_menu = QMenu(self)
 
+            read_action = context_menu.addAction("Read")
             # No explicit icon set here, so no change needed related to edit.svg
             edit_action = context_menu.addAction("Edit Manga")
             delete_action = context_menu.addAction("Delete Manga")
             open_folder_action = context_menu.addAction("Open Folder in Explorer")
 
-            action = context_menu.exec(self.list_widget.mapToGlobal(position))
+            action = context_menu.exec(self.list_view.mapToGlobal(position))
 
-            if action == edit_action:
-                self.edit_selected_manga(item)
+            if action == read_action:
+                self.open_reader(index)
+            elif action == edit_action:
+                self.edit_selected_manga(index)
             elif action == delete_action:
-                self.delete_selected_manga(item)
+                self.delete_selected_manga(index)
             elif action == open_folder_action:
-                self.open_manga_folder_in_browser(item)
+                self.open_manga_folder_in_browser(index)
 
-    def edit_selected_manga(self, item_to_edit):
-        manga_data = item_to_edit.data(Qt.UserRole)
+    def edit_selected_manga(self, index):
+        manga_data = index.data(Qt.UserRole)
         if not manga_data:
             self.notification_popup.show_message("Could not retrieve manga data for editing.", is_error=True, duration_ms=3000)
             return
 
-        dialog = FolderDialog(manga_data["folder"], manga_data=manga_data, parent=self)
+        dialog = FolderDialog(manga_data["folder"], manga_data=manga_data, cover_loader=self.cover_loader, parent=self)
         if dialog.exec() == QDialog.Accepted:
             try:
                 new_data = dialog.get_data()
-                
-                original_folder_path = manga_data["folder"]
-                new_folder_path = new_data["folder"]
-                
-                if os.path.normpath(original_folder_path) != os.path.normpath(new_folder_path) and "uuid" in manga_data:
-                    metadata_dir = "metadata" 
-                    old_file_name = f"{manga_data['uuid']}.json"
-                    old_file_path = os.path.join(metadata_dir, old_file_name)
-                    if os.path.exists(old_file_path):
-                        os.remove(old_file_path)
-                        print(f"DEBUG: Deleted old metadata file: {old_file_path}")
-
-                self.save_metadata(new_data) 
+                self.save_metadata(new_data)
                 self.notification_popup.show_message(f"'{new_data['name']}' updated successfully!", is_error=False, duration_ms=3000)
-                self.load_folders()
             except Exception as e:
                 self.notification_popup.show_message(f"Failed to update manga: {e}", is_error=True, duration_ms=3000)
                 print(f"Failed to update manga: {e}")
         else:
             self.notification_popup.show_message("Editing manga cancelled.", is_error=True, duration_ms=3000)
 
-    def delete_selected_manga(self, item_to_delete):
-        manga_data = item_to_delete.data(Qt.UserRole)
+    def delete_selected_manga(self, index):
+        manga_data = index.data(Qt.UserRole)
         if not manga_data:
             self.notification_popup.show_message("Could not retrieve manga data for deletion.", is_error=True, duration_ms=3000)
             return
@@ -989,24 +5151,12 @@ class MangaReader(QWidget):
 
         if confirm_dialog.exec() == QMessageBox.Yes:
             try:
-                metadata_dir = "metadata" 
-                file_to_delete_path = None
-                if "uuid" in manga_data and manga_data["uuid"]:
-                    file_to_delete_path = os.path.join(metadata_dir, f"{manga_data['uuid']}.json")
-                else:
-                    normalized_folder = os.path.normpath(manga_data["folder"])
-                    safe_name = re.sub(r'[^\w\s.-]', '', os.path.basename(normalized_folder)).strip().replace(' ', '_')
-                    if not safe_name: safe_name = "untitled_folder"
-                    file_to_delete_path = os.path.join(metadata_dir, f"{safe_name}.json")
-
-
-                if file_to_delete_path and os.path.exists(file_to_delete_path):
-                    os.remove(file_to_delete_path)
+                self.library.load()
+                key = index.data(LibraryListModel.KeyRole) or self.library.key_for_folder(manga_data["folder"])
+                if self.delete_entry(key):
                     self.notification_popup.show_message(f"'{manga_name}' deleted successfully!", is_error=False, duration_ms=3000)
-                    self.load_folders()
                 else:
                     self.notification_popup.show_message(f"Metadata file for '{manga_name}' not found (already deleted or renamed?).", is_error=True, duration_ms=5000)
-                    self.load_folders() 
             except Exception as e:
                 self.notification_popup.show_message(f"Failed to delete manga: {e}", is_error=True, duration_ms=3000)
                 print(f"Failed to delete manga: {e}")
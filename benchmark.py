@@ -0,0 +1,317 @@
+"""
+Headless benchmark for MangaQ library operations at scale.
+
+Generates synthetic libraries (one metadata JSON file per entry, with covers drawn from a small
+pool of real JPEGs) in a temporary directory and times the main library operations against them:
+
+    load_folders, load_metadata_table, metadata_exists, save_metadata, update_grid_columns, delete
+
+A separate cover_decode section compares decoding large covers straight at thumbnail size against
+decoding them at full size and scaling afterwards, with the pixels and memory each approach needs.
+
+Runs under QT_QPA_PLATFORM=offscreen, so no display is needed. Results are printed (or written
+with --output) as JSON with wall time, peak RSS and per-operation percentiles, so runs can be
+compared over time.
+
+Usage:
+    python benchmark.py
+    python benchmark.py --sizes 1000,10000 --repeat 5 --output bench.json
+    MANGAQ_STORE=sqlite python benchmark.py --sizes 10000
+"""
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen") # Must be set before Qt is imported
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+try:
+    import resource # Not available on Windows
+except ImportError:
+    resource = None
+
+from PySide6 import __version__ as PYSIDE_VERSION
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QColor, QLinearGradient, QPainter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import MangaQ
+
+
+DEFAULT_SIZES = "1000,10000,100000"
+COVER_POOL_SIZE = 64 # Distinct cover images shared round-robin by the synthetic entries
+LOOKUP_SAMPLES = 2000 # metadata_exists() calls per library size (half hits, half misses)
+SAVE_SAMPLES = 200 # save_metadata() calls per library size; the same entries are then deleted
+GRID_WIDTHS = (700, 900, 1200, 1600, 2200) # Window widths cycled through for update_grid_columns()
+LARGE_COVER_SIZE = (2400, 3600) # Full-resolution scan size used for the cover_decode comparison
+LARGE_COVER_COUNT = 8
+WORDS = ("shadow", "blade", "academy", "dragon", "summer", "night", "hero", "garden", "city", "star",
+         "moon", "school", "demon", "king", "queen", "sword", "spirit", "ocean", "winter", "fire")
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where the platform can't report it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 1) # Bytes on macOS
+    return round(peak / 1024, 1) # Kilobytes on Linux
+
+
+def summarize(samples):
+    """Percentiles (nearest rank) of a list of durations in seconds, reported in milliseconds."""
+    ordered = sorted(samples)
+
+    def percentile(p):
+        index = max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "total_ms": round(sum(ordered) * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50_ms": percentile(50),
+        "p90_ms": percentile(90),
+        "p99_ms": percentile(99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def timed(samples, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    samples.append(time.perf_counter() - start)
+    return result
+
+
+def random_text(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def generate_library(root, size, rng):
+    """Writes `size` metadata files plus a pool of cover images under root; returns the series folders."""
+    library_dir = os.path.join(root, "library")
+    covers_dir = os.path.join(library_dir, "_covers")
+    os.makedirs(MangaQ.METADATA_DIR)
+    os.makedirs(covers_dir)
+
+    covers = []
+    for i in range(COVER_POOL_SIZE):
+        image = QImage(400, 600, QImage.Format_RGB32)
+        image.fill(QColor.fromHsv(i * 360 // COVER_POOL_SIZE, 160, 200))
+        path = os.path.join(covers_dir, f"cover_{i:03d}.jpg")
+        image.save(path, "JPG", 80)
+        covers.append(path)
+
+    folders = []
+    for i in range(size):
+        folder = os.path.join(library_dir, f"Series {i:06d}")
+        entry_uuid = f"{i:08x}-bench"
+        data = {
+            "name": f"{random_text(rng, 3).title()} {i}",
+            "description": random_text(rng, 30),
+            "cover": covers[i % len(covers)],
+            "folder": folder,
+            "uuid": entry_uuid,
+        }
+        with open(os.path.join(MangaQ.METADATA_DIR, f"{entry_uuid}.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        folders.append(folder)
+    return folders
+
+
+def generate_large_covers(directory):
+    """Writes LARGE_COVER_COUNT gradient JPEGs at LARGE_COVER_SIZE (gradients keep the encoder honest)."""
+    paths = []
+    width, height = LARGE_COVER_SIZE
+    for i in range(LARGE_COVER_COUNT):
+        image = QImage(width, height, QImage.Format_RGB32)
+        gradient = QLinearGradient(0, 0, width, height)
+        gradient.setColorAt(0, QColor.fromHsv(i * 360 // LARGE_COVER_COUNT, 200, 230))
+        gradient.setColorAt(1, QColor.fromHsv((i * 360 // LARGE_COVER_COUNT + 120) % 360, 120, 60))
+        painter = QPainter(image)
+        painter.fillRect(image.rect(), gradient)
+        painter.end()
+        path = os.path.join(directory, f"large_{i:02d}.jpg")
+        image.save(path, "JPG", 90)
+        paths.append(path)
+    return paths
+
+
+def run_cover_decode(repeat):
+    """Times the scaled decode against full decode + scale for every cover tier."""
+    root = tempfile.mkdtemp(prefix="mangaq-bench-covers-")
+    try:
+        paths = generate_large_covers(root)
+        results = {}
+        for target in MangaQ.COVER_TIERS:
+            name = f"{target.width()}x{target.height()}"
+            scaled_samples, full_samples = [], []
+            decoded_pixels = full_pixels = 0
+            for _ in range(repeat):
+                for path in paths:
+                    image = timed(scaled_samples, MangaQ.read_scaled_image, path, target)
+                    decoded_pixels += image.width() * image.height()
+
+                    start = time.perf_counter()
+                    full = MangaQ.open_image_reader(path).read()
+                    full.scaled(target, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                    full_samples.append(time.perf_counter() - start)
+                    full_pixels += full.width() * full.height()
+            decodes = repeat * len(paths)
+            results[name] = {
+                "scaled_decode": summarize(scaled_samples),
+                "full_decode_and_scale": summarize(full_samples),
+                "speedup": round(sum(full_samples) / sum(scaled_samples), 2),
+                "megapixels_decoded": round(decoded_pixels / decodes / 1e6, 3),
+                "megapixels_full": round(full_pixels / decodes / 1e6, 3),
+                "memory_saved_mb": round((full_pixels - decoded_pixels) * 4 / decodes / (1024 * 1024), 2), # 4 bytes per ARGB32 pixel
+            }
+        return {"source": f"{LARGE_COVER_SIZE[0]}x{LARGE_COVER_SIZE[1]}", "covers": len(paths), "sizes": results}
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def reset_library(window):
+    """Gives the window a fresh, unloaded library so the next load parses everything again."""
+    window.library = MangaQ.open_library()
+    if window.metadata_watcher is not None:
+        window.metadata_watcher.library = window.library
+
+
+def process_events(app):
+    app.processEvents()
+    app.processEvents()
+
+
+def run_size(app, size, repeat, rng):
+    root = tempfile.mkdtemp(prefix=f"mangaq-bench-{size}-")
+    previous_cwd = os.getcwd()
+    os.chdir(root) # METADATA_DIR, the SQLite file and the thumbnail cache are relative to the working directory
+    window = None
+    try:
+        start = time.perf_counter()
+        folders = generate_library(root, size, rng)
+        generate_seconds = time.perf_counter() - start
+        samples = {name: [] for name in ("load_folders", "load_metadata_table", "metadata_exists",
+                                         "save_metadata", "update_grid_columns", "delete")}
+
+        start = time.perf_counter()
+        if os.environ.get("MANGAQ_STORE", "json").lower() == "sqlite":
+            # Import the JSON files into the database once, outside the timed section
+            MangaQ.open_library().load()
+        window = MangaQ.MangaReader()
+        window.resize(GRID_WIDTHS[0], 700)
+        window.show()
+        process_events(app)
+
+        # Cold loads: every repeat starts from an unloaded library
+        for _ in range(repeat):
+            reset_library(window)
+            timed(samples["load_folders"], window.load_folders)
+            process_events(app)
+        for _ in range(repeat):
+            reset_library(window)
+            timed(samples["load_metadata_table"], window.load_metadata_table)
+            process_events(app)
+
+        probes = [rng.choice(folders) for _ in range(LOOKUP_SAMPLES // 2)]
+        probes += [os.path.join(root, "missing", f"Series {i}") for i in range(LOOKUP_SAMPLES - len(probes))]
+        rng.shuffle(probes)
+        for folder in probes:
+            timed(samples["metadata_exists"], window.metadata_exists, folder)
+
+        window.show_entries_tab()
+        process_events(app)
+        for i in range(repeat * len(GRID_WIDTHS)):
+            window.resize(GRID_WIDTHS[i % len(GRID_WIDTHS)], 700)
+            process_events(app)
+            if hasattr(window, "resize_timer"):
+                window.resize_timer.stop() # Time the direct call only, not the debounced one
+            start_op = time.perf_counter()
+            window.update_grid_columns()
+            process_events(app) # Include the relayout the new grid size triggers
+            samples["update_grid_columns"].append(time.perf_counter() - start_op)
+
+        saved = []
+        for i in range(SAVE_SAMPLES):
+            data = {"name": f"Benchmark Entry {i}", "description": random_text(rng, 30),
+                    "cover": None, "folder": os.path.join(root, "library", f"New Series {i}")}
+            saved.append(timed(samples["save_metadata"], window.save_metadata, data))
+        process_events(app)
+        for key in saved:
+            timed(samples["delete"], window.delete_entry, key)
+        process_events(app)
+        wall_seconds = time.perf_counter() - start
+
+        return {
+            "entries": size,
+            "generate_s": round(generate_seconds, 3),
+            "wall_s": round(wall_seconds, 3),
+            "peak_rss_mb": peak_rss_mb(),
+            "pixmap_cache": window.pixmap_cache.stats(),
+            "operations": {name: summarize(values) for name, values in samples.items()},
+        }
+    finally:
+        if window is not None:
+            window.close()
+            window.deleteLater()
+            process_events(app)
+        os.chdir(previous_cwd)
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MangaQ library operations on synthetic libraries.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"comma-separated library sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="repeats of the load and grid operations per size (default: 3)")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed for the synthetic data")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    sizes = sorted(int(size) for size in args.sizes.split(",") if size.strip())
+    app = QApplication.instance() or QApplication(sys.argv)
+    rng = random.Random(args.seed)
+
+    results = []
+    for size in sizes: # Ascending, so each peak RSS reading belongs to the largest library so far
+        print(f"Benchmarking {size} entries...", file=sys.stderr)
+        with contextlib.redirect_stdout(io.StringIO()): # Keep the app's DEBUG prints out of the timings and the report
+            results.append(run_size(app, size, max(1, args.repeat), rng))
+
+    print("Benchmarking cover decoding...", file=sys.stderr)
+    with contextlib.redirect_stdout(io.StringIO()):
+        cover_decode = run_cover_decode(max(1, args.repeat))
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "pyside": PYSIDE_VERSION,
+        "platform": platform.platform(),
+        "store": os.environ.get("MANGAQ_STORE", "json").lower(),
+        "results": results,
+        "cover_decode": cover_decode,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()